@@ -0,0 +1,87 @@
+"""
+GraphQL endpoint extraction on stored JS bundles.
+
+    python benchmarks/bench_extract_endpoints.py [main.xxxxxxxa.js ...]
+
+Without arguments, benchmarks/fixtures/*.js are used,
+or a synthetic bundle of a similar size if there are no fixtures.
+"""
+import random
+import re
+import string
+import sys
+import timeit
+from pathlib import Path
+
+from twitter_login.gql_endpoints.data import REQUIRED_ENDPOINTS_MAPPING
+from twitter_login.gql_endpoints.extract_endpoint import PATTERN_MAPPING, pattern_strs, scan_endpoints
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+N = 5
+
+
+# all patterns in one alternation, group names suffixed with the pattern index
+COMBINED_PATTERN = re.compile('|'.join(
+    '(?:%s)' % (p % {k: v.replace('>', f'_{i}>', 1) for k, v in PATTERN_MAPPING.items()})
+    for i, p in enumerate(pattern_strs)
+))
+
+
+def single_pass_names(js, required_names):
+    # one finditer over the combined pattern, stopping when every name is seen
+    seen = set()
+    for m in COMBINED_PATTERN.finditer(js):
+        index = m.lastgroup.rsplit('_', 1)[1]
+        name = m.group(f'operationName_{index}')
+        if name in required_names:
+            seen.add(name)
+            if seen == required_names:
+                break
+    return seen
+
+
+def synthetic_bundle(names) -> str:
+    rng = random.Random(0)
+
+    def query_id():
+        return ''.join(rng.choices(string.ascii_letters + string.digits, k=22))
+
+    chunks = []
+    for i in range(40000):
+        chunks.append(f'function a{i}(e,t){{return e.x{i}=t?{{a:"{i}",b:[1,2,3]}}:null}}')
+        if i % 300 == 0:
+            chunks.append(
+                f'e.exports={{queryId:"{query_id()}",operationName:"Filler{i}",operationType:"query",'
+                f'metadata:{{featureSwitches:["a","b"],fieldToggles:[]}}}}}},'
+            )
+    # required endpoints near the end of the bundle
+    for name in names:
+        chunks.append(
+            f'e.exports={{queryId:"{query_id()}",operationName:"{name}",operationType:"query",'
+            f'metadata:{{featureSwitches:["responsive_web_graphql_timeline_navigation_enabled"],fieldToggles:[]}}}}}},'
+        )
+    chunks.append('function zz(){return 0}')
+    return ';'.join(chunks)
+
+
+def main():
+    required_names = set(REQUIRED_ENDPOINTS_MAPPING['main'])
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(FIXTURES_DIR.glob('*.js'))
+    bundles = [(p.name, p.read_text(encoding='utf-8')) for p in paths]
+    if not bundles:
+        bundles = [('synthetic', synthetic_bundle(sorted(required_names)))]
+
+    for name, js in bundles:
+        print(f'{name} ({len(js) / 1024 / 1024:.1f} MB)')
+        found = {e['operationName'] for e in scan_endpoints(js, required_names)}
+        assert found == single_pass_names(js, required_names)
+        # a missing name forces full scans
+        for label, names in (('found', required_names), ('missing', required_names | {'Missing'})):
+            seconds = timeit.timeit(lambda: scan_endpoints(js, names), number=N)
+            print(f'  {label:<8} per-pattern  {seconds / N * 1000:>8.1f} ms')
+            seconds = timeit.timeit(lambda: single_pass_names(js, names), number=N)
+            print(f'  {label:<8} combined     {seconds / N * 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
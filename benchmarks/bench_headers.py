@@ -0,0 +1,45 @@
+"""
+Headers built per second by HTTPClient.build_headers.
+
+    python benchmarks/bench_headers.py
+"""
+import timeit
+
+from twitter_login.headers import HeadersConfig, UserAgent
+from twitter_login.http import HTTPClient
+
+USER_AGENT = UserAgent(
+    ch_ua='"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    ch_ua_mobile='?0',
+    ch_ua_platform='"Windows"',
+    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36'
+)
+URL = 'https://x.com/i/api/graphql/AIdc203rPpK_k_2KWSdm7g/SearchTimeline'
+N = 100_000
+
+
+def main():
+    http = HTTPClient(USER_AGENT)
+    config = HeadersConfig.general_api(
+        referer='https://x.com/search?q=python&src=typed_query',
+        extra_headers={'x-twitter-active-user': 'yes'}
+    )
+    builder = http.headers_builder
+    build = builder.build
+
+    # the same headers are built with and without templates
+    expected = http.build_headers(URL, 'GET', config)
+    builder.build = lambda url, method, dest, is_user_access=None, is_cors=None: (
+        builder.build_uncached(url, method, dest, is_user_access, is_cors)
+    )
+    assert http.build_headers(URL, 'GET', config) == expected
+
+    seconds = timeit.timeit(lambda: http.build_headers(URL, 'GET', config), number=N)
+    print(f'{"uncached":<10} {N / seconds:>12,.0f} headers/sec')
+    builder.build = build
+    seconds = timeit.timeit(lambda: http.build_headers(URL, 'GET', config), number=N)
+    print(f'{"template":<10} {N / seconds:>12,.0f} headers/sec')
+
+
+if __name__ == '__main__':
+    main()
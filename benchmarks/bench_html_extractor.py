@@ -0,0 +1,71 @@
+"""
+HTMLExtractor backends on saved x.com home pages.
+
+    python benchmarks/bench_html_extractor.py [saved_home.html ...]
+
+Without arguments, benchmarks/fixtures/*.html are used,
+or a synthetic page of a similar size if there are no fixtures.
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from twitter_login.gql_endpoints.html import HTMLExtractor
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+N = 20
+
+
+def synthetic_home_page() -> str:
+    initial_state = {
+        'featureSwitch': {
+            'defaultConfig': {f'feature_{i}': {'value': i % 2 == 0} for i in range(2000)}
+        },
+        'entities': {'users': {str(i): {'name': 'x' * 50} for i in range(500)}}
+    }
+    names = {i: f'bundle.Name{i}' for i in range(1500)}
+    hashes = {i: f'{i:07x}' for i in range(1500)}
+    scripts_loaded = (
+        'window.__SCRIPTS_LOADED__={};(()=>{var e=>""+(('
+        + json.dumps(names) + ')[e]||e)+"."+(' + json.dumps(hashes) + ')[e]+"a.js"})();'
+    )
+    body = ''.join(
+        f'<div class="css-{i}" data-testid="cell"><span>item {i}</span></div>'
+        for i in range(3000)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<script nonce="abc">{scripts_loaded}</script></head><body>{body}'
+        f'<script type="text/javascript">window.__INITIAL_STATE__={json.dumps(initial_state)};'
+        'window.__META_DATA__={};</script>'
+        '<script src="https://abs.twimg.com/responsive-web/client-web/main.1234567a.js"></script>'
+        '</body></html>'
+    )
+
+
+def extract_all(html, backend):
+    extractor = HTMLExtractor(html, backend)
+    return (
+        extractor.extract_initial_state(),
+        extractor.extract_js_hash_mapping(),
+        extractor.extract_path_and_mainjs()
+    )
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(FIXTURES_DIR.glob('*.html'))
+    pages = [(p.name, p.read_text(encoding='utf-8')) for p in paths]
+    if not pages:
+        pages = [('synthetic', synthetic_home_page())]
+
+    for name, html in pages:
+        assert extract_all(html, 'scan') == extract_all(html, 'soup')
+        print(f'{name} ({len(html) / 1024:.0f} KB)')
+        for backend in ('soup', 'scan'):
+            seconds = timeit.timeit(lambda: extract_all(html, backend), number=N)
+            print(f'  {backend:<6} {seconds / N * 1000:>8.2f} ms/page')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Retained memory of parsed SearchTimeline pages with and without the identity map.
+
+    python benchmarks/bench_identity_map.py
+
+20 synthetic pages of 100 tweets by 10 authors, half of the tweets repeated
+from the previous page (e.g. overlapping TOP pages).
+A tweet parsed again with new counts is first checked to update the shared
+instance, from the dict and from the msgspec struct.
+"""
+import json
+import tracemalloc
+from types import SimpleNamespace
+
+import msgspec
+from bench_streaming_parse import synthetic_tweet
+
+from twitter_login.enums import RetainSources, SearchTimelineProduct
+from twitter_login.mixins.search import _parse_timeline
+from twitter_login.models.identity import IdentityMap
+from twitter_login.models.schema import TweetResult
+from twitter_login.models.tweet import Tweet
+
+PAGES = 20
+PER_PAGE = 100
+AUTHORS = 10
+
+
+def synthetic_page(page: int) -> bytes:
+    entries = []
+    for i in range(PER_PAGE):
+        tweet_id = page * PER_PAGE // 2 + i
+        entry = synthetic_tweet(tweet_id)
+        user = entry['content']['itemContent']['tweet_results']['result']['core']['user_results']['result']
+        user['rest_id'] = str(1000 + tweet_id % AUTHORS)
+        entries.append(entry)
+    entries.append({'entryId': 'cursor-bottom-0', 'content': {'value': f'page-{page + 1}'}})
+    instructions = [{'type': 'TimelineAddEntries', 'entries': entries}]
+    return json.dumps(
+        {'data': {'search_by_raw_query': {'search_timeline': {'timeline': {'instructions': instructions}}}}}
+    ).encode()
+
+
+def crawl(client, pages):
+    tweets = []
+    for data in pages:
+        items, _, _ = _parse_timeline(client, json.loads(data), SearchTimelineProduct.TOP)
+        for tweet in items:
+            tweet.user
+            tweets.append(tweet)
+    return tweets
+
+
+def check_refresh():
+    client = SimpleNamespace(identity_map=IdentityMap(), retain_sources=RetainSources.RETAIN)
+    payload = synthetic_tweet(0)['content']['itemContent']['tweet_results']['result']
+    tweet = Tweet._from_payload(payload, client)
+    for parse in (Tweet._from_payload, lambda p, c: Tweet._from_struct(msgspec.convert(p, TweetResult), c)):
+        payload['legacy']['favorite_count'] += 1
+        payload['legacy']['favorited'] = not payload['legacy'].get('favorited')
+        payload['views']['count'] = str(int(payload['views'].get('count', 0)) + 1)
+        payload['core']['user_results']['result']['core']['name'] += ' (renamed)'
+        again = parse(payload, client)
+        assert again is tweet
+        assert tweet.favorite_count == payload['legacy']['favorite_count']
+        assert tweet.favorited == payload['legacy']['favorited']
+        assert tweet.view_count == int(payload['views']['count'])
+        assert tweet.user.name == payload['core']['user_results']['result']['core']['name']
+
+
+def main():
+    check_refresh()
+    pages = [synthetic_page(i) for i in range(PAGES)]
+    for label, identity_map in (('disabled', None), ('enabled', IdentityMap())):
+        client = SimpleNamespace(identity_map=identity_map, retain_sources=RetainSources.RETAIN)
+        tracemalloc.start()
+        tweets = crawl(client, pages)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        unique_tweets = len({id(t) for t in tweets})
+        unique_users = len({id(t.user) for t in tweets})
+        print(
+            f'{label:<9} retained {current / 1024:>8,.0f} KiB'
+            f'  tweet objects {unique_tweets:>5}  user objects {unique_users:>5}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Parse and serialize time of each installed JSON backend.
+
+    python benchmarks/bench_json.py [response.json ...]
+
+Without arguments, a synthetic 100 tweets SearchTimeline page is used.
+"""
+import sys
+import timeit
+from pathlib import Path
+
+from bench_streaming_parse import synthetic_response
+
+from twitter_login import json_codec
+
+N = 50
+# a SearchTimeline request: variables and ~40 features
+REQUEST = {
+    'variables': {
+        'rawQuery': 'python lang:en -filter:replies', 'count': 20, 'querySource': 'typed_query',
+        'product': 'Top', 'withGrokTranslatedBio': False, 'withQuickPromoteEligibilityTweetFields': False
+    },
+    'features': {f'responsive_web_feature_switch_{i}_enabled': i % 3 == 0 for i in range(40)}
+}
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]]
+    responses = [(p.name, p.read_bytes()) for p in paths] or [('synthetic', synthetic_response())]
+    for name in json_codec.BACKENDS:
+        try:
+            json_codec.use_backend(name)
+        except ImportError:
+            print(f'{name:<8} not installed')
+            continue
+        for response_name, data in responses:
+            payload = json_codec.loads(data)
+            loads = timeit.timeit(lambda: json_codec.loads(data), number=N) / N
+            dumps = timeit.timeit(lambda: json_codec.dumpb(payload), number=N) / N
+            print(
+                f'{name:<8} {response_name} ({len(data) / 1024:,.0f} KiB)'
+                f' loads {loads * 1000:>7.2f} ms  dumps {dumps * 1000:>7.2f} ms'
+            )
+        request = timeit.timeit(lambda: json_codec.dumps(REQUEST), number=N * 100) / (N * 100)
+        print(f'{name:<8} request dumps {request * 1e6:>7.2f} us')
+
+
+if __name__ == '__main__':
+    main()
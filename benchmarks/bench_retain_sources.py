@@ -0,0 +1,79 @@
+"""
+Retained memory of parsed tweets for each retain_sources policy.
+
+    python benchmarks/bench_retain_sources.py
+
+20 synthetic pages of 100 tweets; only `text` and `user` are read,
+as in a pipeline that never touches cards, notes or entities.
+Each policy is first checked on a note tweet, parsed from the dict and
+from the msgspec struct: the author and the note text are kept by every
+policy and the nested lazy fields are materialized by EAGER.
+"""
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import msgspec
+from bench_streaming_parse import synthetic_response, synthetic_tweet
+
+from twitter_login.enums import RetainSources, SearchTimelineProduct
+from twitter_login.mixins.search import _parse_timeline
+from twitter_login.models.schema import TweetResult
+from twitter_login.models.tweet import Tweet
+
+PAGES = 20
+
+
+def crawl(client, pages):
+    tweets = []
+    for data in pages:
+        items, _, _ = _parse_timeline(client, json.loads(data), SearchTimelineProduct.TOP)
+        for tweet in items:
+            tweet.text, tweet.user
+            tweets.append(tweet)
+    return tweets
+
+
+def check_note_tweet(policy):
+    payload = synthetic_tweet(0)['content']['itemContent']['tweet_results']['result']
+    payload['note_tweet'] = {'note_tweet_results': {'result': {
+        'id': 'Tm90ZVR3ZWV0OjA=', 'text': 'note ' * 100,
+        'entity_set': {'hashtags': [], 'urls': [], 'user_mentions': [], 'symbols': [], 'media': []},
+    }}}
+    client = SimpleNamespace(identity_map=None, retain_sources=policy)
+    for tweet in (
+        Tweet._from_payload(payload, client),
+        Tweet._from_struct(msgspec.convert(payload, TweetResult), client),
+    ):
+        assert tweet.user is not None and tweet.user.id == payload['core']['user_results']['result']['rest_id']
+        assert tweet.full_text == 'note ' * 100
+        if policy == RetainSources.DISCARD:
+            assert tweet.card is None and tweet.urls is None
+            assert tweet.note_tweet.media is None
+        else:
+            assert tweet.note_tweet.media == []
+
+
+def main():
+    for policy in RetainSources:
+        check_note_tweet(policy)
+    pages = [synthetic_response() for _ in range(PAGES)]
+    for policy in RetainSources:
+        client = SimpleNamespace(identity_map=None, retain_sources=policy)
+        tracemalloc.start()
+        start = time.perf_counter()
+        tweets = crawl(client, pages)
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        users = sum(t.user is not None for t in tweets)
+        print(
+            f'{policy:<8} retained {current / 1024:>8,.0f} KiB  {elapsed * 1000:>7.1f} ms'
+            f'  tweets {len(tweets)}  with user {users}'
+        )
+        del tweets
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Peak memory and time of parsing a SearchTimeline page with and without `stream_json`.
+
+    python benchmarks/bench_streaming_parse.py [response.json ...]
+
+Without arguments, a synthetic 100 tweets TOP page is used.
+Requires ijson.
+
+On the synthetic page `stream_json` lowers the peak by about 30%
+and takes about 4x the time of the json parse.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from twitter_login.enums import SearchTimelineProduct
+from twitter_login.mixins.search import _parse_timeline, _parse_timeline_stream
+
+
+def synthetic_tweet(i: int) -> dict:
+    user = {
+        'rest_id': str(1000 + i),
+        'core': {'name': f'user {i}', 'screen_name': f'user_{i}', 'created_at': 'Mon Jan 01 00:00:00 +0000 2024'},
+        'legacy': {
+            'description': 'x' * 160,
+            'entities': {'description': {'urls': []}, 'url': {'urls': [{'expanded_url': 'https://example.com'}]}},
+            'followers_count': i, 'friends_count': i, 'profile_banner_url': 'https://pbs.twimg.com/' + 'b' * 60,
+        },
+        'professional': {'category': [{'id': 1, 'name': 'Science', 'icon_name': 'IconBriefcaseStroke'}]},
+    }
+    media = [
+        {
+            'id_str': str(i * 10 + j), 'media_url_https': 'https://pbs.twimg.com/media/' + 'm' * 15 + '.jpg',
+            'type': 'photo', 'sizes': {s: {'h': 1200, 'w': 900, 'resize': 'fit'} for s in ('large', 'medium', 'small', 'thumb')},
+            'original_info': {'height': 1200, 'width': 900, 'focus_rects': [{'x': 0, 'y': 0, 'w': 900, 'h': 504}] * 4},
+        }
+        for j in range(2)
+    ]
+    return {
+        'entryId': f'tweet-{i}',
+        'sortIndex': str(i),
+        'content': {
+            'entryType': 'TimelineTimelineItem',
+            'itemContent': {
+                'itemType': 'TimelineTweet',
+                'tweet_results': {'result': {
+                    '__typename': 'Tweet',
+                    'rest_id': str(i),
+                    'core': {'user_results': {'result': user}},
+                    'views': {'count': str(i * 10), 'state': 'EnabledWithCount'},
+                    'source': '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+                    'edit_control': {'edit_tweet_ids': [str(i)], 'editable_until_msecs': '1700000000000'},
+                    'legacy': {
+                        'full_text': 'text ' * 50, 'created_at': 'Mon Jan 01 00:00:00 +0000 2024',
+                        'favorite_count': i, 'reply_count': i, 'retweet_count': i, 'quote_count': i,
+                        'lang': 'en', 'user_id_str': str(1000 + i), 'conversation_id_str': str(i),
+                        'entities': {
+                            'hashtags': [{'indices': [0, 5], 'text': 'tag'}] * 3,
+                            'urls': [{'display_url': 'example.com', 'expanded_url': 'https://example.com', 'url': 'https://t.co/x', 'indices': [6, 29]}],
+                            'user_mentions': [], 'symbols': [], 'media': media,
+                        },
+                        'extended_entities': {'media': media},
+                    },
+                }},
+                'tweetDisplayType': 'Tweet',
+            },
+            'clientEventInfo': {'component': 'result', 'element': 'tweet', 'details': {'timelinesDetails': {'controllerData': 'c' * 80}}},
+        },
+    }
+
+
+def synthetic_response(n: int = 100) -> bytes:
+    entries = [synthetic_tweet(i) for i in range(n)]
+    entries.insert(0, {'entryId': 'cursor-top-0', 'content': {'value': 'top'}})
+    entries.append({'entryId': 'cursor-bottom-0', 'content': {'value': 'bottom'}})
+    instructions = [{'type': 'TimelineAddEntries', 'entries': entries}]
+    return json.dumps(
+        {'data': {'search_by_raw_query': {'search_timeline': {'timeline': {'instructions': instructions}}}}}
+    ).encode()
+
+
+def parse_default(data):
+    items, top, bottom = _parse_timeline(None, json.loads(data), SearchTimelineProduct.TOP)
+    return list(items), top, bottom
+
+
+def parse_stream(data):
+    return _parse_timeline_stream(None, data, SearchTimelineProduct.TOP)
+
+
+def measure(parse, data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]]
+    responses = [(p.name, p.read_bytes()) for p in paths] or [('synthetic', synthetic_response())]
+    for name, data in responses:
+        print(f'{name} ({len(data) / 1024:,.0f} KiB)')
+        default, default_peak, default_time = measure(parse_default, data)
+        stream, stream_peak, stream_time = measure(parse_stream, data)
+
+        assert [t.id for t in default[0]] == [t.id for t in stream[0]]
+        assert default[1:] == stream[1:]
+
+        print(f'  {"json":<8} peak {default_peak / 1024:>10,.0f} KiB {default_time * 1000:>8.1f} ms')
+        print(f'  {"stream":<8} peak {stream_peak / 1024:>10,.0f} KiB {stream_time * 1000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
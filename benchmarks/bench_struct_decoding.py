@@ -0,0 +1,63 @@
+"""
+SearchTimeline page decoding: dict tree + _from_payload vs typed msgspec structs + _from_struct.
+
+    python benchmarks/bench_struct_decoding.py [response.json ...]
+
+Without arguments, a synthetic 100 tweets TOP page is used.
+Requires msgspec.
+"""
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from bench_streaming_parse import synthetic_response
+
+from twitter_login import json_codec
+from twitter_login.enums import SearchTimelineProduct
+from twitter_login.mixins.search import _parse_timeline, _parse_timeline_struct
+
+N = 50
+
+
+def parse_dict(data):
+    items, top, bottom = _parse_timeline(None, json_codec.loads(data), SearchTimelineProduct.TOP)
+    return list(items), top, bottom
+
+
+def parse_struct(data):
+    items, top, bottom = _parse_timeline_struct(None, data, SearchTimelineProduct.TOP)
+    return list(items), top, bottom
+
+
+def summary(result):
+    items, top, bottom = result
+    return [(t.id, t.full_text, t.view_count, t.user.screen_name, len(t.media)) for t in items], top, bottom
+
+
+def peak_memory(parse, data):
+    tracemalloc.start()
+    result = parse(data)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]]
+    responses = [(p.name, p.read_bytes()) for p in paths] or [('synthetic', synthetic_response())]
+    print(f'JSON backend: {json_codec.backend()}')
+    for name, data in responses:
+        print(f'{name} ({len(data) / 1024:,.0f} KiB)')
+        assert summary(parse_dict(data)) == summary(parse_struct(data))
+        for label, parse in (('dict', parse_dict), ('struct', parse_struct)):
+            seconds = timeit.timeit(lambda: parse(data), number=N) / N
+            _, current, peak = peak_memory(parse, data)
+            print(
+                f'  {label:<8} {seconds * 1000:>7.2f} ms'
+                f'  peak {peak / 1024:>8,.0f} KiB  retained {current / 1024:>8,.0f} KiB'
+            )
+
+
+if __name__ == '__main__':
+    main()
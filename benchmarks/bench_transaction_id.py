@@ -0,0 +1,61 @@
+"""
+Transaction ID generation throughput.
+
+    python benchmarks/bench_transaction_id.py
+"""
+import base64
+import hashlib
+import random
+import time
+import timeit
+
+from twitter_login.transaction_id import ClientTransaction
+
+KEY = base64.b64encode(bytes(range(48))).decode()
+ANIMATION_KEY = 'a1b2c3d4e5f60102030405060708090a0b0c'
+PATH = '/i/api/graphql/AIdc203rPpK_k_2KWSdm7g/SearchTimeline'
+N = 100_000
+
+
+def legacy_generate_transaction_id(ct: ClientTransaction, method, path, time_now=None):
+    # the implementation before the bytes based fast path
+    time_now = time_now or ct.get_time_now()
+    time_now_bytes = [(time_now >> (i * 8)) & 0xFF for i in range(4)]
+    key_bytes = list(base64.b64decode(bytes(ct.key, 'utf-8')))
+    hash_val = hashlib.sha256(
+        f"{method}!{path}!{time_now}{ct.random_keyword}{ct.animation_key}".encode()).digest()
+    hash_bytes = list(hash_val)
+    random_num = random.randint(0, 255)
+    bytes_arr = [*key_bytes, *time_now_bytes, *hash_bytes[:16], ct.random_number]
+    out = bytearray([random_num, *[item ^ random_num for item in bytes_arr]])
+    return base64.b64encode(out).decode().strip('=')
+
+
+def report(name, seconds, count):
+    print(f'{name:<28} {count / seconds:>12,.0f} ids/sec')
+
+
+def main():
+    ct = ClientTransaction.from_values(KEY, ANIMATION_KEY, 2, [12, 14, 7])
+
+    # both implementations must produce the same ids
+    time_now = ct.get_time_now()
+    random.seed(0)
+    expected = legacy_generate_transaction_id(ct, 'GET', PATH, time_now)
+    random.seed(0)
+    assert ct.generate_transaction_id('GET', PATH, time_now=time_now) == expected
+
+    seconds = timeit.timeit(lambda: legacy_generate_transaction_id(ct, 'GET', PATH), number=N)
+    report('before', seconds, N)
+    seconds = timeit.timeit(lambda: ct.generate_transaction_id('GET', PATH), number=N)
+    report('after', seconds, N)
+
+    burst = 100
+    start = time.perf_counter()
+    for _ in range(N // burst):
+        ct.generate_transaction_ids('GET', PATH, burst)
+    report(f'after (batch of {burst})', time.perf_counter() - start, N)
+
+
+if __name__ == '__main__':
+    main()
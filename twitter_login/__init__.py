@@ -1,3 +1,8 @@
+from .circuit_breaker import CircuitBreaker
 from .client import Client
-from .enums import MediaCategory, SearchTimelineProduct
+from .enums import CircuitState, MediaCategory, RetainSources, SearchTimelineProduct, TweetDetailRankingMode
 from .headers import UserAgent
+from .polling import SearchPoller
+from .pool import ClientPool
+from .response_cache import MemoryResponseCache, SQLiteResponseCache
+from .retry import RetryBudget, RetryPolicy
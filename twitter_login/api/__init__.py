@@ -1,12 +1,13 @@
 from ..gql_endpoints.endpoint import GQLState
 from ..http import HTTPClient
+from ..response_cache import ResponseCache
 from .gql import GQLClient
 from .v11 import V11Client
 from .jetfuel import JetfuelClient
 
 
 class API:
-    def __init__(self, http: HTTPClient, gql_state: GQLState) -> None:
-        self.gql = GQLClient(http, gql_state)
+    def __init__(self, http: HTTPClient, gql_state: GQLState, response_cache: ResponseCache | None = None, coalesce_requests: bool = False) -> None:
+        self.gql = GQLClient(http, gql_state, coalesce=coalesce_requests, response_cache=response_cache)
         self.v11 = V11Client(http)
         self.jetfuel = JetfuelClient(http)
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
 import urllib.parse
 from logging import getLogger
 from typing import TYPE_CHECKING, Any
 
+from curl_cffi import Response
+
+from .. import json_codec
 from ..enums import SEARCH_TIMELINE_PRODUCT_TO_PARAM, SearchTimelineQuerySource
 from ..headers import HeadersConfig
+from ..http import load_json_response
+from ..response_cache import make_key
 from .utils import UNSET, remove_unset
 
 if TYPE_CHECKING:
-    from curl_cffi import Response
+    from ..enums import RatelimitPolicy
+    from ..response_cache import ResponseCache
 
     from ..gql_endpoints.endpoint import Endpoint, GQLState
     from ..http import HTTPClient
@@ -18,35 +25,139 @@ if TYPE_CHECKING:
 logger = getLogger(__name__)
 
 
+def _coalesce_key(endpoint: Endpoint, variables: dict[str, Any] | None, field_toggles: dict[str, bool] | None) -> tuple:
+    # the same read regardless of the order of the variables
+    return (
+        endpoint.operationName,
+        None if variables is None else json_codec.dumps(dict(sorted(remove_unset(variables).items()))),
+        None if field_toggles is None else json_codec.dumps(dict(sorted(field_toggles.items())))
+    )
+
+
+def _cached_response(url: str, content: bytes) -> Response:
+    response = Response()
+    response.url = url
+    response.status_code = 200
+    response.content = content
+    return response
+
+
+def _follower_response(response: Response) -> Response:
+    # a copy without the payload decoded for the first caller,
+    # so that the callers do not share (and modify) the same objects
+    response = copy.copy(response)
+    response.__dict__.pop('_json_payload', None)
+    return response
+
+
 class GQLClient:
-    def __init__(self, http: HTTPClient, state: GQLState) -> None:
+    def __init__(self, http: HTTPClient, state: GQLState, coalesce: bool = False, response_cache: ResponseCache | None = None) -> None:
         self.http = http
         self.endpoints = state.endpoints
         self.feature_switches = state.feature_switches
+        #: Whether concurrent identical GET requests share one in-flight request.
+        self.coalesce = coalesce
+        #: GET requests served by an in-flight identical request.
+        self.coalesce_hits = 0
+        #: GET requests that were sent.
+        self.coalesce_misses = 0
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        #: Cache of the responses of the operations with a TTL in the GQLState. None if disabled.
+        self.response_cache = response_cache
+
+    async def get(self, endpoint: Endpoint, variables: dict[str, Any] | None = None, field_toggles: dict[str, bool] | None = None, referer = None, ratelimit_policy: RatelimitPolicy | None = None, use_cache: bool = True) -> Response:
+        """
+        Sends a GraphQL GET request.
+        With :attr:`coalesce`, identical concurrent requests (same operation, variables,
+        field toggles, referer and rate limit policy) are coalesced: the followers await
+        the request of the first caller and get the same response object.
+        Responses of the operations with a cache TTL are served from :attr:`response_cache` when it is set.
+        With `use_cache=False` the request is sent even if cached, and its response replaces the cached one.
+        """
+        key = None
+        cache_key = ttl = None
+        if self.response_cache is not None:
+            ttl = endpoint.cache_ttl(variables)
+            if ttl:
+                key = _coalesce_key(endpoint, variables, field_toggles)
+                operation, variables_json, field_toggles_json = key
+                cache_key = make_key(
+                    self.http.account_id, endpoint.queryId, operation,
+                    variables_json, endpoint.features_json, field_toggles_json
+                )
+                content = self.response_cache.get(cache_key) if use_cache else None
+                if content is not None:
+                    logger.info(f'GraphQL GET {endpoint.url} (cached)')
+                    return _cached_response(endpoint.url, content)
 
-    async def get(self, endpoint: Endpoint, variables: dict[str, Any] | None = None, field_toggles: dict[str, bool] | None = None, referer = None) -> Response:
+        if not self.coalesce:
+            return await self._get(endpoint, variables, field_toggles, referer, ratelimit_policy, cache_key, ttl)
+
+        if key is None:
+            key = _coalesce_key(endpoint, variables, field_toggles)
+        # a different rate limit policy or referer is a different request
+        key = (*key, referer, ratelimit_policy)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesce_hits += 1
+            logger.debug(f'Coalesced GraphQL GET {endpoint.operationName}')
+            # a cancelled caller does not cancel the request shared with the others
+            return _follower_response(await asyncio.shield(task))
+
+        self.coalesce_misses += 1
+        task = asyncio.ensure_future(
+            self._get(endpoint, variables, field_toggles, referer, ratelimit_policy, cache_key, ttl)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._request_done(key, t))
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # retrieved here in case every caller was cancelled
+            task.exception()
+
+    async def _get(self, endpoint: Endpoint, variables: dict[str, Any] | None, field_toggles: dict[str, bool] | None, referer, ratelimit_policy: RatelimitPolicy | None, cache_key: str | None = None, ttl: float | None = None) -> Response:
         headers_config = HeadersConfig.general_api(referer=referer, extra_headers={
             'x-twitter-active-user': 'yes',
             'x-twitter-auth-type': 'OAuth2Session',
             'x-twitter-client-language': 'en'
         })
-        params = {}
-        features = endpoint.features
+        # the features fragment is serialized once per feature switches update
+        query = []
         if variables is not None:
-            params['variables'] = json.dumps(remove_unset(variables))
-        if features is not None:
-            params['features'] = json.dumps(features)
+            query.append(urllib.parse.urlencode({'variables': json_codec.dumps(remove_unset(variables))}))
+        features_query = endpoint.features_query
+        if features_query is not None:
+            query.append(features_query)
         if field_toggles is not None:
-            params['field_toggles'] = json.dumps(field_toggles)
+            query.append(urllib.parse.urlencode({'field_toggles': json_codec.dumps(field_toggles)}))
+        url = endpoint.url
+        if query:
+            url = f'{url}?{"&".join(query)}'
         response = await self.http.get(
-            endpoint.url,
+            url,
             headers_config,
-            params=params
+            ratelimit_policy=ratelimit_policy
         )
         logger.info(f'GraphQL GET {endpoint.url}')
+        if cache_key is not None and response.status_code == 200 and self._cacheable(response):
+            self.response_cache.set(cache_key, response.content, ttl)
         return response
 
-    async def post(self, endpoint: Endpoint, variables: dict[str, Any] | None = None, add_query_id: bool = False, referer = None) -> Response:
+    @staticmethod
+    def _cacheable(response: Response) -> bool:
+        # the raw body is cached, only for valid JSON without GraphQL errors;
+        # the decoded payload is kept on the response for the parser
+        try:
+            payload = load_json_response(response)
+        except RuntimeError:
+            return False
+        return isinstance(payload, dict) and 'errors' not in payload
+
+    async def post(self, endpoint: Endpoint, variables: dict[str, Any] | None = None, add_query_id: bool = False, referer = None, ratelimit_policy: RatelimitPolicy | None = None) -> Response:
         headers_config = HeadersConfig.general_api(referer=referer, extra_headers={
             'x-twitter-active-user': 'yes',
             'x-twitter-auth-type': 'OAuth2Session',
@@ -63,12 +174,13 @@ class GQLClient:
         response = await self.http.post(
             endpoint.url,
             headers_config,
-            json=data
+            data=json_codec.dumpb(data),
+            ratelimit_policy=ratelimit_policy
         )
         logger.info(f'GraphQL POST {endpoint.url}')
         return response
 
-    async def TweetDetail(self, *, focalTweetId, cursor, referrer, controller_data, rankingMode):
+    async def TweetDetail(self, *, focalTweetId, cursor, referrer, controller_data, rankingMode, ratelimit_policy=None):
         """
         All params: focalTweetId, cursor, referrer, controller_data, rux_context, with_rux_injections, rankingMode,
                     includePromotedContent, withCommunity, withQuickPromoteEligibilityTweetFields, withBirdwatchNotes, withVoice, isReaderMode
@@ -109,6 +221,9 @@ class GQLClient:
             withVoice:
                 Corresponds to "voice_consumption_enabled" feature switch
 
+            ratelimit_policy:
+                Overrides the client rate limit policy (Not a GraphQL param)
+
         Unknown Params:
             rux_context, isReaderMode
         """
@@ -135,7 +250,8 @@ class GQLClient:
             self.endpoints['TweetDetail'],
             variables,
             field_toggles,
-            referer=f'https://x.com/i/status/{focalTweetId}'
+            referer=f'https://x.com/i/status/{focalTweetId}',
+            ratelimit_policy=ratelimit_policy
         )
 
     async def CreateTweet(self, *, tweet_text, card_uri, attachment_url, reply, batch_compose, geo, media, conversation_control):
@@ -201,7 +317,7 @@ class GQLClient:
             referer='https://x.com/compose/post'
         )
 
-    async def SearchTimeline(self, *, rawQuery, count, cursor, querySource, product):
+    async def SearchTimeline(self, *, rawQuery, count, cursor, querySource, product, ratelimit_policy=None, use_cache=True):
         """
         Params:
             rawQuery:
@@ -214,6 +330,10 @@ class GQLClient:
                 See `enums.SearchTimelineQuerySource`
             product:
                 See `SearchTimelineProduct`
+            ratelimit_policy:
+                Overrides the client rate limit policy (Not a GraphQL param)
+            use_cache:
+                False to bypass the response cache lookup (Not a GraphQL param)
         """
         withGrokTranslatedBio = product in ('Top', 'People') and self.feature_switches.get(
             'responsive_web_grok_bio_auto_translation_in_search_is_enabled'
@@ -245,7 +365,9 @@ class GQLClient:
         return await self.get(
             self.endpoints['SearchTimeline'],
             variables,
-            referer=referer
+            referer=referer,
+            ratelimit_policy=ratelimit_policy,
+            use_cache=use_cache
         )
 
     def test(self):
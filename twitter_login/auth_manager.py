@@ -3,14 +3,11 @@ import re
 import time
 from logging import getLogger
 
-from curl_cffi import AsyncSession
-
 from .api import API
 from .constants import COOKIES_DOMAIN
 from .headers import HeadersConfig
 from .http import HTTPClient
-from .transaction_id import ClientTransaction
-from .transaction_id.utils import get_ondemand_file_url, handle_x_migration_async
+from .transaction_id import ClientTransactionProvider, default_provider
 
 logger = getLogger(__name__)
 
@@ -19,9 +16,15 @@ class AuthManager:
     """
     Manages authentication.
     """
-    def __init__(self, http: HTTPClient, api: API) -> None:
+    def __init__(
+        self,
+        http: HTTPClient,
+        api: API,
+        transaction_provider: ClientTransactionProvider | None = None
+    ) -> None:
         self.http = http
         self.api = api
+        self.transaction_provider = transaction_provider or default_provider
 
     def save_cookies(self, path):
         """
@@ -47,12 +50,8 @@ class AuthManager:
             if not self.http.csrf_token:
                 raise KeyError('Failed to get ct0 cookie (probably auth_token is invalid).')
 
-    async def initialize_client_transaction(self):
-        session = AsyncSession()
-        home_page_response = await handle_x_migration_async(session=session)
-        ondemand_file_url = get_ondemand_file_url(response=home_page_response)
-        ondemand_file = await session.get(url=ondemand_file_url)
-        client_transaction = ClientTransaction(home_page_response, ondemand_file)
+    async def initialize_client_transaction(self, ondemand_hash: str | None = None):
+        client_transaction = await self.transaction_provider.get(ondemand_hash)
         self.http.client_transaction = client_transaction
         logger.info('Initalized ClientTransaction')
 
@@ -82,4 +81,3 @@ class AuthManager:
             self.http.cookies.set(k, v, COOKIES_DOMAIN)
         if validate_cookies:
             await self.validate_cookies()
-        await self.initialize_client_transaction()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from logging import getLogger
+
+from .enums import CircuitState
+from .errors import CircuitOpenError
+
+logger = getLogger(__name__)
+
+
+class HostCircuit:
+    def __init__(self, window: int) -> None:
+        self.state = CircuitState.CLOSED
+        #: Consecutive failures while closed.
+        self.failures = 0
+        self.opened_at = 0.0
+        #: Latencies of the latest successful responses in seconds.
+        self.latencies: deque[float] = deque(maxlen=window)
+        #: Probe requests in flight while half-open.
+        self.probes = 0
+
+    def __repr__(self) -> str:
+        return f'<HostCircuit state={self.state} failures={self.failures}>'
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker of :class:`HTTPClient`.
+
+    A host circuit opens after `failure_threshold` consecutive failures
+    (transport errors and 5xx), or when the latency percentile of the latest
+    responses exceeds `latency_threshold`. While open, requests to the host
+    raise :class:`CircuitOpenError` without being sent. After `recovery_timeout`
+    the circuit is half-open: up to `half_open_max` probe requests are sent,
+    a successful probe closes the circuit and a failed one opens it again.
+
+    Parameters
+    ----------
+    failure_threshold : :class:`int`, default=5
+        Consecutive failures that open the circuit.
+    recovery_timeout : :class:`float`, default=30.0
+        Seconds the circuit stays open before probing.
+    latency_threshold : :class:`float` | None, default=None
+        Latency in seconds that opens the circuit. Disabled if None.
+    latency_percentile : :class:`float`, default=0.95
+        The percentile compared with `latency_threshold`.
+    window : :class:`int`, default=50
+        Number of latest latencies kept per host.
+    min_samples : :class:`int`, default=20
+        Minimum number of latencies before the latency check applies.
+    half_open_max : :class:`int`, default=1
+        Maximum number of concurrent probe requests while half-open.
+    """
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        latency_threshold: float | None = None,
+        latency_percentile: float = 0.95,
+        window: int = 50,
+        min_samples: int = 20,
+        half_open_max: int = 1
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1.')
+        if not 0 < latency_percentile <= 1:
+            raise ValueError('latency_percentile must be in (0, 1].')
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latency_threshold = latency_threshold
+        self.latency_percentile = latency_percentile
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.half_open_max = half_open_max
+        self.circuits: dict[str, HostCircuit] = {}
+
+    def _circuit(self, host: str) -> HostCircuit:
+        circuit = self.circuits.get(host)
+        if circuit is None:
+            circuit = self.circuits[host] = HostCircuit(self.window)
+        return circuit
+
+    def state(self, host: str) -> CircuitState:
+        """
+        The state of the host circuit. An open circuit past its recovery timeout is half-open.
+        """
+        circuit = self.circuits.get(host)
+        if circuit is None:
+            return CircuitState.CLOSED
+        if circuit.state == CircuitState.OPEN and time.time() >= circuit.opened_at + self.recovery_timeout:
+            return CircuitState.HALF_OPEN
+        return circuit.state
+
+    def is_available(self, host: str) -> bool:
+        """
+        Whether a request to the host would be sent now.
+        """
+        state = self.state(host)
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN:
+            circuit = self.circuits[host]
+            return circuit.state == CircuitState.OPEN or circuit.probes < self.half_open_max
+        return False
+
+    def before_request(self, host: str) -> bool:
+        """
+        Raises :class:`CircuitOpenError` if the request must not be sent.
+        Returns whether the request is a half-open probe.
+        Every call that does not raise must be followed by :meth:`record`.
+        """
+        if not self.is_available(host):
+            circuit = self.circuits[host]
+            raise CircuitOpenError(host, circuit.opened_at + self.recovery_timeout)
+        circuit = self._circuit(host)
+        if circuit.state == CircuitState.OPEN:
+            circuit.state = CircuitState.HALF_OPEN
+            logger.info(f'Circuit half-open for {host}')
+        if circuit.state == CircuitState.HALF_OPEN:
+            circuit.probes += 1
+            return True
+        return False
+
+    def record(self, host: str, healthy: bool | None, latency: float = 0.0, probe: bool = False) -> None:
+        """
+        healthy:
+            None if the request did not complete (cancelled, rate limited before sending, ...).
+        probe:
+            The value returned by :meth:`before_request`.
+        """
+        circuit = self._circuit(host)
+        if probe:
+            circuit.probes -= 1
+        if healthy is None:
+            return
+        if circuit.state != CircuitState.CLOSED and not probe:
+            # sent before the circuit opened
+            return
+
+        if not healthy:
+            circuit.failures += 1
+            if probe:
+                self._open(host, circuit, 'failed probe')
+            elif circuit.failures >= self.failure_threshold:
+                self._open(host, circuit, f'{circuit.failures} consecutive failures')
+            return
+
+        circuit.failures = 0
+        if probe:
+            circuit.state = CircuitState.CLOSED
+            logger.info(f'Circuit closed for {host}')
+            return
+        circuit.latencies.append(latency)
+        percentile = self._latency_percentile(circuit)
+        if percentile is not None and percentile > self.latency_threshold:
+            self._open(host, circuit, f'p{self.latency_percentile * 100:g} latency {percentile:.2f}s')
+
+    def _latency_percentile(self, circuit: HostCircuit) -> float | None:
+        if self.latency_threshold is None or len(circuit.latencies) < self.min_samples:
+            return None
+        latencies = sorted(circuit.latencies)
+        return latencies[math.ceil(self.latency_percentile * len(latencies)) - 1]
+
+    def _open(self, host: str, circuit: HostCircuit, reason: str) -> None:
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = time.time()
+        circuit.failures = 0
+        circuit.latencies.clear()
+        logger.warning(f'Circuit open for {host} ({reason}). Retrying in {self.recovery_timeout} seconds.')
+
+    def __repr__(self) -> str:
+        return '<CircuitBreaker (' + ', '.join(
+            f'{host}: {self.state(host)}' for host in self.circuits
+        ) + ')>'
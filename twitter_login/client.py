@@ -5,22 +5,57 @@ from pathlib import Path
 
 from .api import API
 from .auth_manager import AuthManager
+from .enums import RetainSources
 from .gql_endpoints import GQLEndpointsManager
 from .http import HTTPClient
+from .models.identity import IdentityMap
 from .mixins import *
+from .pagination import resume_pagination
+from .ratelimits import normalize_host
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .gql_endpoints.endpoint import GQLState
     from .headers import UserAgent
+    from .pagination import PaginatedResult
+    from .response_cache import ResponseCache
+    from .transaction_id import ClientTransactionProvider
 
 
 class Client(SearchMixin, TweetMixin, MediaMixin):
-    def __init__(self, user_agent: UserAgent, impersonate: str, *args, **kwargs):
+    def __init__(
+        self,
+        user_agent: UserAgent,
+        impersonate: str,
+        *args,
+        gql_state: GQLState | None = None,
+        transaction_provider: ClientTransactionProvider | None = None,
+        stream_json: bool = False,
+        struct_decoding: bool = False,
+        identity_map_size: int | None = None,
+        retain_sources: RetainSources = RetainSources.RETAIN,
+        response_cache: ResponseCache | None = None,
+        coalesce_requests: bool = False,
+        **kwargs
+    ):
         http = HTTPClient(user_agent, impersonate=impersonate, *args, **kwargs)
-        self._gql_endpoints_manager = GQLEndpointsManager(http)
-        self._api = API(http, self._gql_endpoints_manager.state)
-        self._auth_manager = AuthManager(http, self._api)
+        self._http = http
+        self._gql_endpoints_manager = GQLEndpointsManager(http, gql_state)
+        # share one in-flight request between identical concurrent GraphQL GETs
+        self._api = API(http, self._gql_endpoints_manager.state, response_cache, coalesce_requests)
+        self._auth_manager = AuthManager(http, self._api, transaction_provider)
         self.ratelimits = http.ratelimits_manager
+        #: Per-host circuit breaker, passed as `circuit_breaker`. None if disabled.
+        self.circuit_breaker = http.circuit_breaker
+        # parse timeline responses incrementally with ijson: about 30% lower peak memory per page
+        # but about 4x the parse time (benchmarks/bench_streaming_parse.py), for memory-bound crawls only
+        self._stream_json = stream_json
+        # decode timeline responses into typed msgspec structs (takes precedence over stream_json)
+        self._struct_decoding = struct_decoding
+        #: Shares repeated tweets and users by rest_id. None if disabled.
+        self.identity_map = IdentityMap(identity_map_size) if identity_map_size else None
+        #: What parsed tweets keep of the raw payloads of their lazy fields.
+        self.retain_sources = RetainSources(retain_sources)
 
     async def load_cookies(
         self,
@@ -57,6 +92,17 @@ class Client(SearchMixin, TweetMixin, MediaMixin):
         # Update GQL endpoints
         if update_gql_endpoints:
             await self._gql_endpoints_manager.update_state()
+        # The ondemand file hash found in the GQL html lets a cached
+        # ClientTransaction be reused without fetching the pages again.
+        await self._auth_manager.initialize_client_transaction(
+            self._gql_endpoints_manager.ondemand_hash
+        )
+
+    async def close(self) -> None:
+        """
+        Closes the HTTP session of the client.
+        """
+        await self._http.close()
 
     def save_cookies(self, path: str | Path):
         """
@@ -68,3 +114,39 @@ class Client(SearchMixin, TweetMixin, MediaMixin):
             A path to the file to save.
         """
         self._auth_manager.save_cookies(path)
+
+    async def resume(self, state: bytes | str) -> PaginatedResult:
+        """
+        Resumes a pagination saved by :meth:`PaginatedResult.to_state`.
+
+        Parameters
+        ----------
+        state : :class:`bytes` | :class:`str`
+            The saved pagination state.
+
+        Returns
+        -------
+        :class:`PaginatedResult`
+            The page following the saved page.
+            Empty if the saved page was the last one.
+
+        Raises
+        ------
+        ValueError
+            Invalid pagination state.
+        """
+        return await resume_pagination(self, state)
+
+    def is_host_available(self, url: str) -> bool:
+        """
+        Whether a request to the host of `url` would be sent now.
+        False while the circuit of the host is open.
+
+        Parameters
+        ----------
+        url : :class:`str`
+            A URL of the host.
+        """
+        if self.circuit_breaker is None:
+            return True
+        return self.circuit_breaker.is_available(normalize_host(url))
@@ -18,6 +18,40 @@ class UserState(StrEnum):
     NOT_LOGGED_IN = 'not_logged_in'
 
 
+class RatelimitPolicy(StrEnum):
+    #: Send the request without checking rate limits.
+    IGNORE = 'ignore'
+    #: Wait until the rate limit is reset.
+    WAIT = 'wait'
+    #: Raise :class:`RatelimitExceeded` immediately.
+    RAISE = 'raise'
+
+
+class RetainSources(StrEnum):
+    #: Keep the raw payload of each lazy field until it is first accessed.
+    RETAIN = 'retain'
+    #: Materialize every lazy field when parsed and free the raw payloads.
+    EAGER = 'eager'
+    #: Drop the raw payloads of the card and the entities when parsed; they return None.
+    #: The note tweet is parsed eagerly so that :attr:`Tweet.full_text` stays complete.
+    DISCARD = 'discard'
+
+
+class CircuitState(StrEnum):
+    #: Requests are sent.
+    CLOSED = 'closed'
+    #: Requests fail fast until the recovery timeout.
+    OPEN = 'open'
+    #: A limited number of probe requests are sent.
+    HALF_OPEN = 'half_open'
+
+
+class TweetDetailRankingMode(StrEnum):
+    RELEVANCE = 'Relevance'
+    RECENCY = 'Recency'
+    LIKES = 'Likes'
+
+
 class MediaState(StrEnum):
     PENDING = 'pending'
     IN_PROGRESS = 'in_progress'
@@ -3,12 +3,27 @@ class TwitterException(Exception):
 
 
 class HTTPError(TwitterException):
-    def __init__(self, status_code, message):
+    def __init__(self, status_code, message, headers=None):
         self.status_code = status_code
         self.message = message
+        self.headers = headers
         super().__init__(f'{status_code}: {message}')
 
 
+class RatelimitExceeded(TwitterException):
+    def __init__(self, url, reset):
+        self.url = url
+        self.reset = reset
+        super().__init__(f'Rate limit exceeded for {url}. Resets at {reset}.')
+
+
+class CircuitOpenError(TwitterException):
+    def __init__(self, host, retry_at):
+        self.host = host
+        self.retry_at = retry_at
+        super().__init__(f'Circuit open for {host}. Retry after {retry_at}.')
+
+
 class LoginError(TwitterException):
     ...
 
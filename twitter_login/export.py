@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Sequence
+
+from . import json_codec
+from .models import Tweet, User
+
+if TYPE_CHECKING:
+    from .pagination import PaginatedResult
+
+logger = getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+#: Exported attributes, also used as column names.
+TWEET_COLUMNS = (
+    'id', 'created_at', 'view_count', 'bookmark_count', 'favorite_count', 'quote_count',
+    'reply_count', 'retweet_count', 'lang', 'user_id', 'conversation_id', 'full_text'
+)
+USER_COLUMNS = ('id', 'name', 'screen_name', 'created_at')
+COLUMNS = {
+    Tweet: TWEET_COLUMNS,
+    User: USER_COLUMNS
+}
+#: Value types of the known non-string columns.
+#: The type of other columns is inferred from their first value.
+COLUMN_TYPES = {
+    'view_count': int,
+    'bookmark_count': int,
+    'favorite_count': int,
+    'quote_count': int,
+    'reply_count': int,
+    'retweet_count': int,
+    'bookmarked': bool,
+    'favorited': bool,
+    'is_quote_status': bool,
+    'retweeted': bool
+}
+
+
+def column_type(name: str, values: list) -> type:
+    """
+    Returns the value type of a column: bool, int, float or str.
+    """
+    if name in COLUMN_TYPES:
+        return COLUMN_TYPES[name]
+    for value in values:
+        if value is None:
+            continue
+        # bool is checked before int, its subclass
+        for type_ in (bool, int, float, str):
+            if isinstance(value, type_):
+                return type_
+        raise TypeError(
+            f'Column "{name}" has unsupported values of type {value.__class__.__name__}. '
+            'Only bool, int, float and str columns can be exported.'
+        )
+    return str
+
+
+def to_columns(items: Sequence[Any], columns: Sequence[str] | None = None) -> dict[str, list]:
+    """
+    Converts tweets or users into a columnar batch: {column name: values}.
+    """
+    if not items:
+        return {}
+    if columns is None:
+        item_type = type(items[0])
+        if any(type(item) is not item_type for item in items):
+            names = sorted({type(item).__name__ for item in items})
+            raise TypeError(
+                f'Cannot export a batch mixing {", ".join(names)}. '
+                'Pass `columns` explicitly or export each type separately.'
+            )
+        try:
+            columns = COLUMNS[item_type]
+        except KeyError:
+            raise TypeError(f'Unsupported item type for export: {items[0].__class__.__name__}') from None
+    return {
+        name: [getattr(item, name) for item in items]
+        for name in columns
+    }
+
+
+async def iter_batches(
+    items: AsyncIterable[Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Sequence[str] | None = None
+) -> AsyncIterator[dict[str, list]]:
+    """
+    Groups an async iterable of tweets or users into columnar batches of `batch_size` rows.
+    Only one batch of items is held at a time.
+    """
+    if batch_size <= 0:
+        raise ValueError('batch_size must be positive.')
+    buffer = []
+    async for item in items:
+        buffer.append(item)
+        if len(buffer) >= batch_size:
+            yield to_columns(buffer, columns)
+            buffer = []
+    if buffer:
+        yield to_columns(buffer, columns)
+
+
+class NDJSONWriter:
+    """
+    Writes columnar batches as newline-delimited JSON.
+    """
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open('wb')
+
+    def write_batch(self, batch: dict[str, list]) -> None:
+        if not batch:
+            return
+        names = list(batch)
+        self._file.writelines(
+            json_codec.dumpb(dict(zip(names, row))) + b'\n'
+            for row in zip(*batch.values())
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes columnar batches to a Parquet file, one row group per batch.
+    The schema is taken from the columns of the first batch: the known columns
+    have a fixed type and the others are typed from their first value.
+    Requires the `pyarrow` library.
+    """
+    def __init__(self, path: str | Path) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ModuleNotFoundError:
+            raise ImportError(
+                'The "pyarrow" library is required to export Parquet files. '
+                'Please install pyarrow or export NDJSON instead.'
+            )
+        self.path = Path(path)
+        self._pa = pyarrow
+        self._writer = None
+
+    def write_batch(self, batch: dict[str, list]) -> None:
+        if not batch:
+            return
+        pa = self._pa
+        if self._writer is None:
+            arrow_types = {bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string()}
+            self.schema = pa.schema([
+                (name, arrow_types[column_type(name, values)])
+                for name, values in batch.items()
+            ])
+            self._writer = pa.parquet.ParquetWriter(self.path, self.schema)
+        elif list(batch) != self.schema.names:
+            raise ValueError(
+                f'Batch columns {list(batch)} do not match the file columns {self.schema.names}.'
+            )
+        self._writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=self.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path: str | Path, format: str | None = None) -> NDJSONWriter | ParquetWriter:
+    """
+    format:
+        "ndjson" or "parquet". Inferred from the file extension if None.
+    """
+    path = Path(path)
+    if format is None:
+        format = 'parquet' if path.suffix == '.parquet' else 'ndjson'
+    if format == 'ndjson':
+        return NDJSONWriter(path)
+    if format == 'parquet':
+        return ParquetWriter(path)
+    raise ValueError(f'Unknown export format: "{format}"')
+
+
+async def export(
+    result: PaginatedResult,
+    path: str | Path,
+    format: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **kwargs
+) -> int:
+    """Exports the items of the pages starting from `result` to a file.
+
+    The file is written batch by batch while the pages are fetched,
+    so memory is bounded by `batch_size` regardless of the crawl size.
+
+    Parameters
+    ----------
+    result : :class:`PaginatedResult`
+        The first page of tweets or users.
+    path : :class:`str` | :class:`Path`
+        The output file.
+    format : :class:`str` | None, default=None
+        "ndjson" or "parquet" (requires pyarrow).
+        Inferred from the file extension if None.
+    batch_size : :class:`int`, default=1000
+        Number of rows per batch.
+    **kwargs
+        Passed to :meth:`PaginatedResult.to_batches`.
+
+    Returns
+    -------
+    :class:`int`
+        The number of rows written.
+    """
+    writer = open_writer(path, format)
+    count = 0
+    try:
+        async for batch in result.to_batches(batch_size, **kwargs):
+            writer.write_batch(batch)
+            count += len(next(iter(batch.values())))
+    finally:
+        writer.close()
+    logger.info(f'Exported {count} rows to {path}')
+    return count
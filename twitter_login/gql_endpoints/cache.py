@@ -1,19 +1,21 @@
-import json
+import hashlib
+import os
 from logging import getLogger
 from pathlib import Path
 
+from .. import json_codec
 from .extract_endpoint import validate_endpoint
 
 logger = getLogger(__name__)
 default_dir = Path(__file__).parent.parent.resolve() / '.cache'
+DEFAULT_EXTRACTION_CACHE_BYTES = 16 * 1024 * 1024
 
 
 def load_json(path: Path, validator):
     if not path.exists():
         return None
     try:
-        with path.open(encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_codec.loads(path.read_bytes())
     except Exception as e:
         logger.warning(f'Failed to load cache from "{path}": {e}')
         return
@@ -32,8 +34,7 @@ def dump_json(path: Path, obj, validator):
         logger.warning(f'Invalid cache: {v}')
         return
     try:
-        with path.open('w', encoding='utf-8') as f:
-            json.dump(obj, f)
+        path.write_bytes(json_codec.dumpb(obj))
     except Exception as e:
         logger.warning(f'Failed to cache data to "{path}": {e}')
         return
@@ -68,6 +69,17 @@ def validate_feature_switches(data):
             return f'Invalid feature switch value "{v}"'
 
 
+def validate_extraction(data):
+    if not isinstance(data, dict):
+        return f'Invalid data type "{data.__class__.__name__}"'
+    if not isinstance(data.get('filename'), str) or not isinstance(data.get('hash'), str):
+        return 'Invalid extraction key'
+    names = data.get('names')
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        return 'Invalid extraction names'
+    return validate_endpoints(data.get('endpoints'))
+
+
 class GQLCache:
     """
     GraphQL API endpoint cache
@@ -116,3 +128,71 @@ class GQLCache:
         self.make_cache_dir()
         dump_json(self.feature_switches_path, obj, validate_feature_switches)
 
+
+class ExtractionCache:
+    """
+    Endpoints extracted from JS files, keyed by (filename, hash).
+    The directory size is bounded and the least recently used entries are evicted.
+    """
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_EXTRACTION_CACHE_BYTES) -> None:
+        if cache_dir is None:
+            cache_dir = default_dir / 'extracted'
+        if isinstance(cache_dir, str):
+            cache_dir = Path(cache_dir)
+        self.dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def path(self, filename: str, hash: str) -> Path:
+        key = hashlib.sha1(f'{filename}.{hash}'.encode()).hexdigest()
+        return self.dir / f'{key}.json'
+
+    def get(self, filename: str, hash: str, required_names: set[str]):
+        """
+        Returns the cached endpoints or None.
+        The entry is a miss if it was extracted for fewer names than required.
+        """
+        path = self.path(filename, hash)
+        data = load_json(path, validate_extraction)
+        if data is None:
+            return None
+        if data['filename'] != filename or data['hash'] != hash:
+            return None
+        if not required_names <= set(data['names']):
+            return None
+        try:
+            # mark as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return [e for e in data['endpoints'] if e['operationName'] in required_names]
+
+    def put(self, filename: str, hash: str, required_names: set[str], endpoints) -> None:
+        if not self.dir.exists():
+            self.dir.mkdir(parents=True)
+        data = {
+            'filename': filename,
+            'hash': hash,
+            'names': sorted(required_names),
+            'endpoints': endpoints
+        }
+        dump_json(self.path(filename, hash), data, validate_extraction)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the directory fits in max_bytes.
+        """
+        entries = []
+        for path in self.dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda x: x[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f'Evicted extraction cache {path}')
@@ -1,10 +1,24 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
 from logging import getLogger
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import urlencode
+
+from .. import json_codec
+from ..response_cache import search_timeline_ttl, tweet_detail_ttl
 
-from .extract_endpoint import GQLEndpointDict
+if TYPE_CHECKING:
+    from .extract_endpoint import GQLEndpointDict
 
 logger = getLogger(__name__)
 
+#: Response cache TTL of the GET operations, in seconds or computed from the variables.
+DEFAULT_CACHE_TTLS = {
+    'SearchTimeline': search_timeline_ttl,
+    'TweetDetail': tweet_detail_ttl
+}
+
 
 @dataclass
 class Endpoint:
@@ -12,13 +26,30 @@ class Endpoint:
     queryId: str
     feature_switches: dict[str, bool]
     metadata: dict | None = None
+    #: The state the feature switches belong to. Used to invalidate cached features.
+    state: GQLState | None = field(default=None, repr=False, compare=False)
+    # (state version, features, features JSON, features query fragment)
+    _features_cache: tuple | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def url(self) -> str:
         return f'https://x.com/i/api/graphql/{self.queryId}/{self.operationName}'
 
-    @property
-    def features(self) -> list[str] | None:
+    def _cached_features(self) -> tuple:
+        version = self.state.version if self.state else None
+        cache = self._features_cache
+        if cache is not None and version is not None and cache[0] == version:
+            return cache
+        features = self._build_features()
+        if features is None:
+            cache = (version, None, None, None)
+        else:
+            features_json = json_codec.dumps(features)
+            cache = (version, features, features_json, urlencode({'features': features_json}))
+        self._features_cache = cache
+        return cache
+
+    def _build_features(self) -> dict[str, bool] | None:
         if not self.metadata:
             return
         names = self.metadata.get('featureSwitches')
@@ -29,6 +60,35 @@ class Endpoint:
             for name in names
         }
 
+    @property
+    def features(self) -> dict[str, bool] | None:
+        return self._cached_features()[1]
+
+    @property
+    def features_json(self) -> str | None:
+        """
+        The serialized features, cached until the feature switches are updated.
+        """
+        return self._cached_features()[2]
+
+    @property
+    def features_query(self) -> str | None:
+        """
+        URL-encoded `features=...` query fragment.
+        """
+        return self._cached_features()[3]
+
+    def cache_ttl(self, variables: dict | None) -> float | None:
+        """
+        Seconds a response to these variables can be cached, or None if it is not cached.
+        """
+        if self.state is None:
+            return None
+        ttl = self.state.cache_ttls.get(self.operationName)
+        if callable(ttl):
+            ttl = ttl(variables or {})
+        return ttl or None
+
     @property
     def field_toggles(self) -> list[str] | None:
         if self.metadata:
@@ -50,13 +110,20 @@ class GQLState:
         self.endpoints: dict[str, Endpoint] = {}
         self.feature_switches: dict[str, bool] = {}
         self.hash_mapping: dict[str, str] = {}
+        # incremented when the feature switches change
+        self.version = 0
+        # {operationName: ttl}, operations not listed are not cached
+        self.cache_ttls: dict[str, float | Callable[[dict], float | None]] = dict(DEFAULT_CACHE_TTLS)
 
     def update_endpoints(self, endpoint_dicts: list[GQLEndpointDict]) -> None:
         for endpoint_dict in endpoint_dicts:
-            self.endpoints[endpoint_dict['operationName']] = Endpoint(**endpoint_dict, feature_switches=self.feature_switches)
+            self.endpoints[endpoint_dict['operationName']] = Endpoint(
+                **endpoint_dict, feature_switches=self.feature_switches, state=self
+            )
 
     def update_feature_switches(self, feature_switches_dict: dict):
         self.feature_switches.update(feature_switches_dict)
+        self.version += 1
         # required = self.required_feature_switches()
         # for k, v in feature_switches_dict.items():
         #     if k in required:
@@ -22,6 +22,10 @@ pattern_strs = [
     r'params:\{id:"%(id)s",metadata:%(meta)s,name:"%(name)s",operationKind:".+?",text:',
     r'function [a-zA-Z$]{2}\(\)\{this.[a-z0-9_]{5}="%(id)s",this.[a-z0-9_]{5}="%(name)s"\}'
 ]
+# The patterns are scanned one by one on purpose. Each starts with a literal, so re
+# finds candidates with a fast literal search. A single alternation of the three
+# loses that search and was several times slower on real bundles
+# (see benchmarks/bench_extract_endpoints.py).
 PATTERNS = [re.compile(s % PATTERN_MAPPING) for s in pattern_strs]
 
 
@@ -43,13 +47,10 @@ def validate_endpoint(endpoint) -> bool:
     return True
 
 
-def js_file_extract_endpoints(
-    js: str,
-    required_names: set[str] | None = None,
-    missing_endpoint_handler: Callable[[str], GQLEndpointDict] | None = None
-) -> list[GQLEndpointDict]:
+def scan_endpoints(js: str, required_names: set[str] | None = None) -> list[GQLEndpointDict]:
     """
-    Extracts endpoints in js with required_names
+    Extracts endpoints in js.
+    If required_names is given, only those endpoints are extracted, once each.
     """
     results = []
     seen = set()
@@ -83,21 +84,45 @@ def js_file_extract_endpoints(
 
             if required_names and required_names == seen:
                 return results
+    return results
 
-    if required_names:
-        missings = required_names - seen
-        if missings and not missing_endpoint_handler:
-            raise ValueError(f'GraphQL endpoint {missings} not found and no missing_endpoint_handler provided.')
-        for missing in missings:
-            fallback = missing_endpoint_handler(missing)
-            if not fallback:
-                raise ValueError(f'GraphQL endpoint "{missing}" not found.')
-            logger.warning(f'"GraphQL endpoint {missing}" not found in JS.')
-            results.append(fallback)
 
+def fill_missing_endpoints(
+    results: list[GQLEndpointDict],
+    required_names: set[str] | None = None,
+    missing_endpoint_handler: Callable[[str], GQLEndpointDict] | None = None
+) -> list[GQLEndpointDict]:
+    """
+    Adds fallback endpoints for required_names not found in results.
+    """
+    results = list(results)
+    if not required_names:
+        return results
+
+    missings = required_names - {e['operationName'] for e in results}
+    if missings and not missing_endpoint_handler:
+        raise ValueError(f'GraphQL endpoint {missings} not found and no missing_endpoint_handler provided.')
+    for missing in missings:
+        fallback = missing_endpoint_handler(missing)
+        if not fallback:
+            raise ValueError(f'GraphQL endpoint "{missing}" not found.')
+        logger.warning(f'"GraphQL endpoint {missing}" not found in JS.')
+        results.append(fallback)
     return results
 
 
+def js_file_extract_endpoints(
+    js: str,
+    required_names: set[str] | None = None,
+    missing_endpoint_handler: Callable[[str], GQLEndpointDict] | None = None
+) -> list[GQLEndpointDict]:
+    """
+    Extracts endpoints in js with required_names
+    """
+    results = scan_endpoints(js, required_names)
+    return fill_missing_endpoints(results, required_names, missing_endpoint_handler)
+
+
 async def _extract_endpoints(
     js_aiter: AsyncGenerator[tuple[str, str], None]
 ) -> tuple[list[GQLEndpointDict], dict[str, set[str]]]:
@@ -1,9 +1,15 @@
 import json
 import re
+from functools import cached_property
+from logging import getLogger
 
 import chompjs
 from bs4 import BeautifulSoup
 
+logger = getLogger(__name__)
+
+INITIAL_STATE_MARKER = 'window.__INITIAL_STATE__'
+SCRIPTS_LOADED_MARKER = 'window.__SCRIPTS_LOADED__'
 INITIAL_STATE_PATTERN = re.compile(r'window.__INITIAL_STATE__')
 SCRIPTS_LOADED_PATTERN = re.compile(r'window.__SCRIPTS_LOADED__')
 JSON_PATTERN = re.compile(r'window\.__INITIAL_STATE__\s*=\s*({.*?});')
@@ -13,18 +19,57 @@ ID_TO_NAME_OBJECT_PATTERN = re.compile(r'e=>""\+\(\((\{.+?\})\)')
 ID_TO_HASH_OBJECT_PATTERN = re.compile(r'"\."\+\((\{.+\})\)')
 
 
+def scan_script_text(html: str, marker: str) -> str | None:
+    """
+    Returns the text of the first <script> tag containing the marker.
+    Scans the raw html without building a tree.
+    """
+    index = html.find(marker)
+    while index != -1:
+        start = html.rfind('<script', 0, index)
+        if start != -1 and html.find('</script>', start, index) == -1:
+            open_end = html.find('>', start, index)
+            close = html.find('</script>', index)
+            if open_end != -1 and close != -1:
+                return html[open_end + 1:close]
+        index = html.find(marker, index + len(marker))
+    return None
+
+
 class HTMLExtractor:
-    """Class for extracting data from html."""
+    """Class for extracting data from html.
 
-    def __init__(self, html) -> None:
+    backend:
+        "scan" scans the raw html and falls back to BeautifulSoup if a tag is not found.
+        "soup" always uses BeautifulSoup.
+    """
+
+    def __init__(self, html, backend: str = 'scan') -> None:
+        if backend not in ('scan', 'soup'):
+            raise ValueError(f'Unknown backend: "{backend}"')
         self.html = html
-        self.soup = BeautifulSoup(html, 'html.parser')
+        self.backend = backend
 
-    def extract_initial_state(self):
-        script_tag = self.soup.find('script', string=INITIAL_STATE_PATTERN)
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, 'html.parser')
+
+    def find_script_text(self, marker: str, pattern: re.Pattern) -> str | None:
+        if self.backend == 'scan':
+            text = scan_script_text(self.html, marker)
+            if text is not None:
+                return text
+            logger.info(f'"{marker}" not found by scanning. Falling back to BeautifulSoup.')
+        script_tag = self.soup.find('script', string=pattern)
         if not script_tag:
+            return None
+        return script_tag.text
+
+    def extract_initial_state(self):
+        script_text = self.find_script_text(INITIAL_STATE_MARKER, INITIAL_STATE_PATTERN)
+        if script_text is None:
             raise ValueError('__INITIAL_STATE__ not found in html.')
-        match = JSON_PATTERN.search(script_tag.text)
+        match = JSON_PATTERN.search(script_text)
         if not match:
             raise ValueError('__INITIAL_STATE__ not found in html.')
         initial_state_json = match.group(1)
@@ -35,18 +80,18 @@ class HTMLExtractor:
         return initial_state
 
     def extract_js_hash_mapping(self) -> dict[str, str]:
-        script_tag = self.soup.find('script', string=SCRIPTS_LOADED_PATTERN)
-        if not script_tag:
+        script_text = self.find_script_text(SCRIPTS_LOADED_MARKER, SCRIPTS_LOADED_PATTERN)
+        if script_text is None:
             raise ValueError('script tag not found in html.')
 
         # {346: "bundle.NotABot",
         #  652: "ondemand.countries-zh",
         #  666: "bundle.Delegate", ...}
-        id_to_name_table_match = ID_TO_NAME_OBJECT_PATTERN.search(script_tag.text)
+        id_to_name_table_match = ID_TO_NAME_OBJECT_PATTERN.search(script_text)
         # {346: "c79eb1b",
         #  652: "44a1037",
         #  666: "7bb1cc0", ...}
-        id_to_hash_table_match = ID_TO_HASH_OBJECT_PATTERN.search(script_tag.text)
+        id_to_hash_table_match = ID_TO_HASH_OBJECT_PATTERN.search(script_text)
 
         if not id_to_name_table_match:
             raise ValueError('JavaScript id to name table not found in html.')
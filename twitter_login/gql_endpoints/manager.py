@@ -4,11 +4,12 @@ from typing import AsyncGenerator
 
 from ..headers import HeadersConfig
 from ..http import HTTPClient
+from ..transaction_id.constants import ON_DEMAND_FILE_NAME
 from ..utils import optional_chaining
-from .cache import GQLCache
+from .cache import ExtractionCache, GQLCache
 from .data import BUILDTIME_DEFAULT_FEATURE_SWITCHES, BUILDTIME_ENDPOINTS, BUILDTIME_HASH_MAPPING, REQUIRED_ENDPOINTS_MAPPING
 from .endpoint import GQLState
-from .extract_endpoint import js_file_extract_endpoints
+from .extract_endpoint import fill_missing_endpoints, scan_endpoints
 from .html import HTMLExtractor
 
 logger = getLogger(__name__)
@@ -18,19 +19,24 @@ class GQLEndpointsManager:
     """
     A class for updating GQL endpoints antomatically.
     """
-    def __init__(self, http: HTTPClient) -> None:
+    def __init__(self, http: HTTPClient, state: GQLState | None = None) -> None:
         """
         required_endpoints_mapping : {'filename1': ['OperationName1', 'OperationName2', ...], ...}
         hash_mapping        : {'filename1': 'abcd1234', 'filename2': 'efgh5678'}
+        state               : An existing GQLState to share with other managers.
         """
         self.http = http
         self.required_endpoints_mapping = REQUIRED_ENDPOINTS_MAPPING
         self.initial_state: dict | None = None
         self.js_hash_mapping: dict | None = None
         self.js_url_path: str | None = None
-        self.state = GQLState()
         self.cache = GQLCache()
-        self.load_cached_or_buildtime_data()
+        self.extraction_cache = ExtractionCache()
+        if state is None:
+            self.state = GQLState()
+            self.load_cached_or_buildtime_data()
+        else:
+            self.state = state
 
     def load_cached_or_buildtime_data(self):
         """Loads cached data or build-time data if no cache is exists."""
@@ -57,6 +63,15 @@ class GQLEndpointsManager:
             raise ValueError(f'Wrong JS file name: {main_js_filename}')
         self.js_hash_mapping[parts[0]] = parts[1].removesuffix('a')
 
+    @property
+    def ondemand_hash(self) -> str | None:
+        """
+        Hash of the ondemand file used by ClientTransaction, if the html is loaded.
+        """
+        if not self.js_hash_mapping:
+            return None
+        return self.js_hash_mapping.get(ON_DEMAND_FILE_NAME)
+
     def get_update_required_files(self) -> list[tuple[str, str]]:
         """
         Return files whose hashes differ from the current hashes.
@@ -81,7 +96,10 @@ class GQLEndpointsManager:
     def build_file_url(self, filename, hash):
         return f'{self.js_url_path}{filename}.{hash}a.js'
 
-    async def update_required_js_aiter(self) -> AsyncGenerator[tuple[str, str], None]:
+    async def update_required_js_aiter(
+        self,
+        files_data: list[tuple[str, str]] | None = None
+    ) -> AsyncGenerator[tuple[str, str], None]:
         """
         Yields filename and jsfile content.
         """
@@ -93,11 +111,34 @@ class GQLEndpointsManager:
             async with sem:
                 response = await self.http.get(url, headers_config)
                 return filename, response.text
-        files_data = self.get_update_required_files()
+        if files_data is None:
+            files_data = self.get_update_required_files()
         tasks = [asyncio.create_task(fetch_file(f, h)) for f, h in files_data]
         for i in asyncio.as_completed(tasks):
             yield await i
 
+    async def extracted_endpoints_aiter(self) -> AsyncGenerator[tuple[str, list], None]:
+        """
+        Yields filename and the endpoints extracted from it.
+        Files already extracted are loaded from the extraction cache without fetching.
+        """
+        files_data = []
+        for filename, hash in self.get_update_required_files():
+            required_names = set(self.required_endpoints_mapping[filename])
+            cached = self.extraction_cache.get(filename, hash, required_names)
+            if cached is None:
+                files_data.append((filename, hash))
+                continue
+            logger.info(f'Loaded extracted endpoints of {filename}.{hash} from cache')
+            yield filename, cached
+
+        hashes = dict(files_data)
+        async for filename, js in self.update_required_js_aiter(files_data):
+            required_names = set(self.required_endpoints_mapping[filename])
+            endpoints = scan_endpoints(js, required_names)
+            self.extraction_cache.put(filename, hashes[filename], required_names, endpoints)
+            yield filename, endpoints
+
     def handle_missing_endpoint(self, name):
         """
         Handles missing endpoint.
@@ -120,9 +161,9 @@ class GQLEndpointsManager:
 
     async def fetch_updated_endpoints(self):
         results = []
-        async for filename, js in self.update_required_js_aiter():
-            results += js_file_extract_endpoints(
-                js, set(
+        async for filename, endpoints in self.extracted_endpoints_aiter():
+            results += fill_missing_endpoints(
+                endpoints, set(
                     self.required_endpoints_mapping[filename]), self.handle_missing_endpoint
             )
             logger.info(f'Updated {len(results)} from {filename}')
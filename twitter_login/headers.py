@@ -5,8 +5,9 @@ Generates the appropriate headers for each request.
 from __future__ import annotations
 
 from enum import Enum
-from typing import NamedTuple, Type
-from urllib.parse import urlparse
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Type
+from urllib.parse import urlparse, urlsplit
 
 
 class FetchDest(Enum):
@@ -147,6 +148,8 @@ class HeadersBuilder:
     def __init__(self, user_agent: UserAgent, domain: str = 'x.com') -> None:
         self.user_agent = user_agent
         self.domain = domain
+        # (host, method, dest, is_user_access, is_cors) -> frozen headers
+        self._templates: dict[tuple, Mapping[str, str | None]] = {}
 
     def ua_headers(self):
         return {
@@ -157,6 +160,26 @@ class HeadersBuilder:
         }
 
     def build(self, url: str, method: str, dest: FetchDest, is_user_access: bool = None, is_cors: bool = None):
+        """
+        Returns a new headers dict copied from the cached template.
+        """
+        return dict(self.template(urlsplit(url).hostname, method, dest, is_user_access, is_cors))
+
+    def template(self, host: str, method: str, dest: FetchDest, is_user_access: bool = None, is_cors: bool = None) -> Mapping[str, str | None]:
+        """
+        Returns the frozen headers for the request kind.
+        The headers only depend on the host, not on the rest of the url.
+        """
+        key = (host, method, dest, is_user_access, is_cors)
+        template = self._templates.get(key)
+        if template is None:
+            template = MappingProxyType(
+                self.build_uncached(f'https://{host}/', method, dest, is_user_access, is_cors)
+            )
+            self._templates[key] = template
+        return template
+
+    def build_uncached(self, url: str, method: str, dest: FetchDest, is_user_access: bool = None, is_cors: bool = None):
         context = HeadersContext(
             self.domain, url, method, dest, is_user_access, is_cors
         )
@@ -1,16 +1,21 @@
-import json
+import asyncio
+import time
 from logging import INFO, getLogger
 from typing import Any, TYPE_CHECKING
-from urllib.parse import urlparse
+from urllib.parse import unquote, urlparse
 
 import curl_cffi
 from curl_cffi import Response
 
+from . import json_codec
+from .circuit_breaker import CircuitBreaker
 from .constants import AUTHORIZATION, COOKIES_DOMAIN
+from .enums import RatelimitPolicy
 from .errors import HTTPError
 from .headers import HeadersBuilder, HeadersConfig
-from .ratelimits import RatelimitsManager
+from .ratelimits import RatelimitScheduler, RatelimitsManager, normalize_host
 from .headers import UserAgent
+from .retry import RetryPolicy, RetryStats
 
 if TYPE_CHECKING:
     from .transaction_id import ClientTransaction
@@ -20,9 +25,24 @@ http_logger = getLogger(__name__+'.http')
 
 
 class HTTPClient(curl_cffi.AsyncSession):
-    def __init__(self, user_agent: UserAgent, *args, **kwargs):
+    def __init__(
+        self,
+        user_agent: UserAgent,
+        *args,
+        ratelimit_policy: RatelimitPolicy = RatelimitPolicy.IGNORE,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
         self.ratelimits_manager = RatelimitsManager()
+        self.ratelimit_policy = ratelimit_policy
+        # failed requests are not retried if None
+        self.retry_policy = retry_policy
+        self.retry_stats = RetryStats()
+        # requests to a failing host are sent anyway if None
+        self.circuit_breaker = circuit_breaker
+        self.ratelimit_scheduler = RatelimitScheduler(self.ratelimits_manager)
         self.client_transaction: ClientTransaction | None = None
         self.headers_builder = HeadersBuilder(user_agent)
 
@@ -31,20 +51,94 @@ class HTTPClient(curl_cffi.AsyncSession):
         method: str,
         url: str,
         headers_config: HeadersConfig,
+        *,
+        ratelimit_policy: RatelimitPolicy | None = None,
         **kwargs,
     ) -> Response:
+        """
+        ratelimit_policy:
+            Overrides `self.ratelimit_policy` for this request.
+        Failed requests are retried according to `self.retry_policy`.
+        """
         if 'headers' in kwargs:
             raise ValueError('Use headers_config instead of headers.')
 
-        headers = self.build_headers(url, method, headers_config)
-        logger.info(f'Build headers for {method} {url[:100]}...')
-        if http_logger.isEnabledFor(INFO):
-            http_logger.info(
-                'Method: %s URL: %s\n\n%s\n\n', method, url,
-                json.dumps(headers, indent=4, ensure_ascii=False)
+        policy = self.retry_policy
+        if policy is None:
+            return await self._send(method, url, headers_config, ratelimit_policy, **kwargs)
+
+        stats = self.retry_stats
+        host = normalize_host(url)
+        stats.requests += 1
+        policy.budget.deposit(host)
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.attempts += 1
+            try:
+                return await self._send(method, url, headers_config, ratelimit_policy, **kwargs)
+            except HTTPError as e:
+                error, status_code, headers = e, e.status_code, e.headers
+            except curl_cffi.CurlError as e:
+                error, status_code, headers = e, None, None
+
+            delay = policy.retry_delay(url, method, attempt, status_code, headers)
+            if delay is None:
+                raise error
+            if not policy.budget.withdraw(host):
+                stats.budget_exhausted += 1
+                logger.warning(f'Retry budget exhausted for {host}, not retrying {method} {url[:100]}')
+                raise error
+            stats.retries += 1
+            stats.wait_time += delay
+            logger.info(
+                f'Retrying {method} {url[:100]} in {delay:.1f} seconds '
+                f'(attempt {attempt + 1}/{policy.max_attempts}): {error}'
+            )
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers_config: HeadersConfig,
+        ratelimit_policy: RatelimitPolicy | None,
+        **kwargs
+    ) -> Response:
+        breaker = self.circuit_breaker
+        host = normalize_host(url)
+        # fails fast if the host circuit is open
+        probe = breaker is not None and breaker.before_request(host)
+        healthy = None
+        latency = 0.0
+        try:
+            # wait before building headers so that the transaction id is fresh
+            ratelimit_key = await self.ratelimit_scheduler.acquire(
+                url, ratelimit_policy or self.ratelimit_policy
             )
+            try:
+                headers = self.build_headers(url, method, headers_config)
+                logger.info(f'Build headers for {method} {url[:100]}...')
+                if http_logger.isEnabledFor(INFO):
+                    http_logger.info(
+                        'Method: %s URL: %s\n\n%s\n\n', method, url,
+                        json_codec.dumps_pretty(headers)
+                    )
+                started = time.monotonic()
+                response: Response = await super().request(method, url, headers=headers, **kwargs)
+                latency = time.monotonic() - started
+                self.ratelimits_manager.update(url, response.headers)
+            finally:
+                self.ratelimit_scheduler.release(ratelimit_key)
+            # 5xx are failures of the host, 4xx are answers to the request
+            healthy = response.status_code < 500
+        except curl_cffi.CurlError:
+            healthy = False
+            raise
+        finally:
+            if breaker is not None:
+                breaker.record(host, healthy, latency, probe)
 
-        response: Response = await super().request(method, url, headers=headers, **kwargs)
         status_code = response.status_code
         if 400 <= status_code < 600:
             MESSAGE_MAX_LENGTH = 2000
@@ -52,9 +146,8 @@ class HTTPClient(curl_cffi.AsyncSession):
                 message = response.text[:MESSAGE_MAX_LENGTH]
             except:
                 message = ''
-            raise HTTPError(status_code, message)
+            raise HTTPError(status_code, message, response.headers)
 
-        self.ratelimits_manager.update(url, response.headers)
         return response
 
     async def get(self, url: str, headers_config: HeadersConfig, **kwargs) -> Response:
@@ -92,6 +185,16 @@ class HTTPClient(curl_cffi.AsyncSession):
     def guest_token(self):
         return self.cookies.get('gt', domain=COOKIES_DOMAIN)
 
+    @property
+    def account_id(self) -> str | None:
+        """
+        ID of the logged-in account from the `twid` cookie (`u=<id>`), or None.
+        """
+        twid = self.cookies.get('twid', domain=COOKIES_DOMAIN)
+        if not twid:
+            return None
+        return unquote(twid).strip('"').removeprefix('u=')
+
     async def _request(self, method, url, *args, **kwargs):
         # original request
         http_logger.info(f'{method}:{url}')
@@ -99,9 +202,15 @@ class HTTPClient(curl_cffi.AsyncSession):
 
 
 def load_json_response(response: Response) -> dict | list | Any:
+    # decoded once per response (e.g. when checked for the response cache)
+    payload = getattr(response, '_json_payload', None)
+    if payload is not None:
+        return payload
     try:
-        return response.json()
-    except json.JSONDecodeError as e:
+        payload = json_codec.loads(response.content)
+    except json_codec.decode_errors() as e:
         raise RuntimeError(
             f'Invalid JSON response. Response: {response}, Body: {response.text[:200]}'
         ) from e
+    response._json_payload = payload
+    return payload
@@ -0,0 +1,127 @@
+"""
+JSON codec used for requests, responses and caches.
+orjson or msgspec is used when installed, the standard library otherwise.
+All backends produce compact JSON without ASCII escaping.
+"""
+import json
+from typing import Any
+
+BACKENDS = ('orjson', 'msgspec', 'json')
+
+
+class StdlibCodec:
+    name = 'json'
+    decode_errors = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self.dumps(obj).encode()
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return json.dumps(obj, indent=4, ensure_ascii=False)
+
+
+class OrjsonCodec:
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+        self.decode_errors = (orjson.JSONDecodeError,)
+        self.loads = orjson.loads
+        self.dumpb = orjson.dumps
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj).decode()
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2).decode()
+
+
+class MsgspecCodec:
+    name = 'msgspec'
+
+    def __init__(self) -> None:
+        import msgspec
+        self._msgspec = msgspec
+        self.decode_errors = (msgspec.DecodeError,)
+        self.loads = msgspec.json.Decoder().decode
+        self.dumpb = msgspec.json.Encoder().encode
+
+    def dumps(self, obj: Any) -> str:
+        return self.dumpb(obj).decode()
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return self._msgspec.json.format(self.dumps(obj), indent=4)
+
+
+_CODECS = {
+    'orjson': OrjsonCodec,
+    'msgspec': MsgspecCodec,
+    'json': StdlibCodec
+}
+
+
+def _create(name: str):
+    if name not in _CODECS:
+        raise ValueError(f'Unknown JSON backend "{name}". Available: {", ".join(BACKENDS)}')
+    try:
+        return _CODECS[name]()
+    except ModuleNotFoundError:
+        raise ImportError(
+            f'The "{name}" library is required to use it as the JSON backend. '
+            f'Please install {name} or use another backend.'
+        )
+
+
+def _default():
+    for name in BACKENDS:
+        try:
+            return _create(name)
+        except ImportError:
+            continue
+
+
+codec = _default()
+
+
+def use_backend(name: str) -> None:
+    """
+    Switches the JSON backend for the whole process.
+    name:
+        "orjson", "msgspec" or "json"
+    """
+    global codec
+    codec = _create(name)
+
+
+def backend() -> str:
+    return codec.name
+
+
+def loads(data: bytes | str) -> Any:
+    return codec.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    return codec.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    return codec.dumpb(obj)
+
+
+def dumps_pretty(obj: Any) -> str:
+    return codec.dumps_pretty(obj)
+
+
+def decode_errors() -> tuple[type[Exception], ...]:
+    """
+    Exceptions raised by `loads` on invalid input for the current backend.
+    """
+    return codec.decode_errors
@@ -8,3 +8,5 @@ if TYPE_CHECKING:
 
 class BaseMixin:
     _api: API
+    _stream_json: bool
+    _struct_decoding: bool
@@ -1,21 +1,266 @@
-from typing import Any, Literal, overload
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Iterable, Literal, overload
 
-from ..enums import InstructionType, SearchTimelineProduct, SearchTimelineQuerySource
+from .. import json_codec
+from ..enums import InstructionType, RatelimitPolicy, SearchTimelineProduct, SearchTimelineQuerySource
+from ..errors import ResponseError
+from ..http import load_json_response
 from ..models.tweet import Tweet
 from ..models.user import User
 from ..pagination import PaginatedResult, PaginationContext
 from ..parsers import (
+    decode_search_timeline,
+    entry_id_to_type,
     get_cursors_from_entries,
     get_cursors_from_replace_entries,
     get_instructions,
+    get_instructions_stream,
     group_entries,
+    group_list_by_key,
     handle_response_errors,
-    parse_entries
+    parse_entries,
+    parse_struct_entries
 )
 from ..utils import optional_chaining
 from .base import BaseMixin
 
 
+INSTRUCTIONS_PATH = ('data', 'search_by_raw_query', 'search_timeline', 'timeline', 'instructions')
+
+
+def _parse_timeline(client, payload, product):
+    """
+    Returns (items iterator, cursor-top, cursor-bottom) or None for an empty result.
+    """
+    handle_response_errors(payload)
+
+    instructions = get_instructions(payload, *INSTRUCTIONS_PATH)
+
+    if InstructionType.TIMELINE_ADD_ENTRIES not in instructions:
+        return None
+
+    # Extract TimelineAddEntries entries from instructions
+    entries = group_entries(
+        instructions.get(InstructionType.TIMELINE_ADD_ENTRIES)[0]['entries']
+    )
+    replace_entry_instructions = instructions.get(InstructionType.TIMELINE_REPLACE_ENTRY)
+
+    if InstructionType.TIMELINE_ADD_TO_MODULE in instructions:
+        add_to_module = instructions[InstructionType.TIMELINE_ADD_TO_MODULE][0]
+        module_type = add_to_module['moduleEntryId']
+
+        if module_type.startswith('search-grid'):
+            # MEDIA with a cursor
+            cursor_top, cursor_bottom = get_cursors_from_replace_entries(
+                replace_entry_instructions
+            )
+            if 'moduleItems' not in add_to_module:
+                raise ValueError('moduleItems not found in "search-grid"')
+            entry_results = add_to_module['moduleItems']
+
+        elif module_type.startswith('list-search'):
+            # LIST with a cursor
+            return None  ## TODO List support
+
+        else:
+            raise ValueError(f'Unknown moduleEntryId "{module_type}"')
+
+    else:
+        if 'search-grid' in entries:
+            # MEDIA without a cursor
+            cursor_top, cursor_bottom = get_cursors_from_entries(entries)
+            items = optional_chaining(entries['search-grid'][0], 'content', 'items')
+            if not items:
+                raise ValueError('Items not found in "search-grid"')
+            entry_results = group_entries(items)['search-grid-0-tweet']
+
+        elif 'list-search' in entries:
+            # LIST without a cursor
+            return None  ## TODO List support
+
+        else:
+            if ('cursor-top' in entries or 'cursor-bottom' in entries):
+                # LATEST or TOP without a cursor
+                cursor_top, cursor_bottom = get_cursors_from_entries(entries)
+
+            else:
+                # LATEST or TOP with a cursor
+                cursor_top, cursor_bottom = get_cursors_from_replace_entries(
+                    replace_entry_instructions
+                )
+
+            if product == SearchTimelineProduct.USER:
+                entry_results = entries['user']
+            else:
+                entry_results = entries['tweet']
+
+    return parse_entries(client, entry_results), cursor_top, cursor_bottom
+
+
+def _parse_timeline_stream(client, data, product):
+    """
+    Incremental counterpart of _parse_timeline, with the same results and errors.
+    The entries are read from the body and parsed into models one at a time,
+    so only one raw entry is alive at a time.
+    """
+    instructions = get_instructions_stream(data, *INSTRUCTIONS_PATH)
+
+    if InstructionType.TIMELINE_ADD_ENTRIES not in instructions:
+        return None
+
+    entries = instructions.get(InstructionType.TIMELINE_ADD_ENTRIES)[0]['entries']
+    replace_entry_instructions = instructions.get(InstructionType.TIMELINE_REPLACE_ENTRY)
+
+    if InstructionType.TIMELINE_ADD_TO_MODULE in instructions:
+        add_to_module = instructions[InstructionType.TIMELINE_ADD_TO_MODULE][0]
+        module_type = add_to_module['moduleEntryId']
+
+        if module_type.startswith('search-grid'):
+            # MEDIA with a cursor
+            cursor_top, cursor_bottom = get_cursors_from_replace_entries(
+                replace_entry_instructions
+            )
+            if 'moduleItems' not in add_to_module:
+                raise ValueError('moduleItems not found in "search-grid"')
+            return list(parse_entries(client, add_to_module['moduleItems'])), cursor_top, cursor_bottom
+
+        elif module_type.startswith('list-search'):
+            # LIST with a cursor
+            return None  ## TODO List support
+
+        else:
+            raise ValueError(f'Unknown moduleEntryId "{module_type}"')
+
+    # The entries are read once: the first entry of each type decides like in _parse_timeline,
+    # and the items are parsed as they are read.
+    item_type = 'user' if product == SearchTimelineProduct.USER else 'tweet'
+    items = []
+    first_entries = {}
+    for entry in entries:
+        type = entry_id_to_type(entry['entryId'])
+        if type == item_type:
+            items.extend(parse_entries(client, (entry,)))
+        elif type in ('search-grid', 'list-search', 'cursor-top', 'cursor-bottom'):
+            first_entries.setdefault(type, [entry])
+
+    if 'search-grid' in first_entries:
+        # MEDIA without a cursor
+        cursor_top, cursor_bottom = get_cursors_from_entries(first_entries)
+        grid_items = optional_chaining(first_entries['search-grid'][0], 'content', 'items')
+        if not grid_items:
+            raise ValueError('Items not found in "search-grid"')
+        items = list(parse_entries(client, group_entries(grid_items)['search-grid-0-tweet']))
+
+    elif 'list-search' in first_entries:
+        # LIST without a cursor
+        return None  ## TODO List support
+
+    elif 'cursor-top' in first_entries or 'cursor-bottom' in first_entries:
+        # LATEST or TOP without a cursor
+        cursor_top, cursor_bottom = get_cursors_from_entries(first_entries)
+
+    else:
+        # LATEST or TOP with a cursor
+        cursor_top, cursor_bottom = get_cursors_from_replace_entries(
+            replace_entry_instructions
+        )
+
+    return items, cursor_top, cursor_bottom
+
+
+def _parse_timeline_struct(client, data, product):
+    """
+    Counterpart of _parse_timeline for the typed schema (models.schema).
+    Falls back to _parse_timeline if the response does not match the schema.
+    """
+    response = decode_search_timeline(data)
+    if response is None:
+        return _parse_timeline(client, json_codec.loads(data), product)
+    if response.errors:
+        raise ResponseError(response.errors)
+
+    try:
+        raw_instructions = response.data.search_by_raw_query.search_timeline.timeline.instructions
+    except AttributeError:
+        raw_instructions = None
+    if not raw_instructions:
+        raise ValueError('instructions not found in response.')
+    instructions = group_list_by_key(raw_instructions, lambda x: x.type)
+
+    if InstructionType.TIMELINE_ADD_ENTRIES not in instructions:
+        return None
+
+    entries = group_list_by_key(
+        instructions[InstructionType.TIMELINE_ADD_ENTRIES][0].entries or [],
+        lambda x: entry_id_to_type(x.entryId or '')
+    )
+    replace_entries = [i.entry for i in instructions.get(InstructionType.TIMELINE_REPLACE_ENTRY, [])]
+
+    if InstructionType.TIMELINE_ADD_TO_MODULE in instructions:
+        add_to_module = instructions[InstructionType.TIMELINE_ADD_TO_MODULE][0]
+        module_type = add_to_module.moduleEntryId or ''
+
+        if module_type.startswith('search-grid'):
+            # MEDIA with a cursor
+            cursor_top, cursor_bottom = _get_struct_cursors(replace_entries)
+            if add_to_module.moduleItems is None:
+                raise ValueError('moduleItems not found in "search-grid"')
+            entry_results = add_to_module.moduleItems
+
+        elif module_type.startswith('list-search'):
+            # LIST with a cursor
+            return None  ## TODO List support
+
+        else:
+            raise ValueError(f'Unknown moduleEntryId "{module_type}"')
+
+    else:
+        if 'search-grid' in entries:
+            # MEDIA without a cursor
+            cursor_top, cursor_bottom = _get_struct_cursors(entries['cursor-top'] + entries['cursor-bottom'])
+            items = entries['search-grid'][0].content and entries['search-grid'][0].content.items
+            if not items:
+                raise ValueError('Items not found in "search-grid"')
+            entry_results = items
+
+        elif 'list-search' in entries:
+            # LIST without a cursor
+            return None  ## TODO List support
+
+        else:
+            if ('cursor-top' in entries or 'cursor-bottom' in entries):
+                # LATEST or TOP without a cursor
+                cursor_top, cursor_bottom = _get_struct_cursors(entries['cursor-top'] + entries['cursor-bottom'])
+
+            else:
+                # LATEST or TOP with a cursor
+                cursor_top, cursor_bottom = _get_struct_cursors(replace_entries)
+
+            if product == SearchTimelineProduct.USER:
+                entry_results = entries['user']
+            else:
+                entry_results = entries['tweet']
+
+    return parse_struct_entries(client, entry_results), cursor_top, cursor_bottom
+
+
+def _get_struct_cursors(cursor_entries):
+    """
+    Extracts (cursor-top, cursor-bottom) from the typed schema entries.
+    """
+    cursor_top = cursor_bottom = None
+    for entry in cursor_entries:
+        if entry is None or not entry.entryId or entry.content is None:
+            continue
+        type = entry_id_to_type(entry.entryId)
+        if type == 'cursor-top':
+            cursor_top = entry.content.value
+        elif type == 'cursor-bottom':
+            cursor_bottom = entry.content.value
+    return cursor_top, cursor_bottom
+
+
 class SearchMixin(BaseMixin):
     @overload
     async def search(
@@ -24,7 +269,9 @@ class SearchMixin(BaseMixin):
         product: Literal[SearchTimelineProduct.USER],
         count: int = ...,
         cursor: str | None = ...,
-        query_source: SearchTimelineQuerySource = ...
+        query_source: SearchTimelineQuerySource = ...,
+        ratelimit_policy: RatelimitPolicy | None = ...,
+        use_cache: bool = ...
     ) -> PaginatedResult[User]:
         ...
 
@@ -41,7 +288,9 @@ class SearchMixin(BaseMixin):
         ],
         count: int = ...,
         cursor: str | None = ...,
-        query_source: SearchTimelineQuerySource = ...
+        query_source: SearchTimelineQuerySource = ...,
+        ratelimit_policy: RatelimitPolicy | None = ...,
+        use_cache: bool = ...
     ) -> PaginatedResult[Tweet]:
         ...
 
@@ -51,83 +300,29 @@ class SearchMixin(BaseMixin):
         product: SearchTimelineProduct,
         count: int = 20,
         cursor: str | None = None,
-        query_source: SearchTimelineQuerySource = SearchTimelineQuerySource.TYPED
+        query_source: SearchTimelineQuerySource = SearchTimelineQuerySource.TYPED,
+        ratelimit_policy: RatelimitPolicy | None = None,
+        use_cache: bool = True
     ) -> PaginatedResult[Any]:
         response = await self._api.gql.SearchTimeline(
             rawQuery=query,
             count=count,
             cursor=cursor,
             querySource=query_source,
-            product=product
-        )
-        payload = response.json()
-        handle_response_errors(payload)
-
-        instructions = get_instructions(
-            payload, 'data', 'search_by_raw_query', 'search_timeline', 'timeline', 'instructions'
-        )
-
-        if InstructionType.TIMELINE_ADD_ENTRIES not in instructions:
-            return PaginatedResult._empty()
-
-        # Extract TimelineAddEntries entries from instructions
-        entries = group_entries(
-            instructions.get(InstructionType.TIMELINE_ADD_ENTRIES)[0]['entries']
+            product=product,
+            ratelimit_policy=ratelimit_policy,
+            use_cache=use_cache
         )
-        replace_entry_instructions = instructions.get(InstructionType.TIMELINE_REPLACE_ENTRY)
-
-
-        if InstructionType.TIMELINE_ADD_TO_MODULE in instructions:
-            add_to_module = instructions[InstructionType.TIMELINE_ADD_TO_MODULE][0]
-            module_type = add_to_module['moduleEntryId']
-
-            if module_type.startswith('search-grid'):
-                # MEDIA with a cursor
-                cursor_top, cursor_bottom = get_cursors_from_replace_entries(
-                    replace_entry_instructions
-                )
-                if 'moduleItems' not in add_to_module:
-                    raise ValueError('moduleItems not found in "search-grid"')
-                entry_results = add_to_module['moduleItems']
-
-            elif module_type.startswith('list-search'):
-                # LIST with a cursor
-                return PaginatedResult._empty()  ## TODO List support
-
-            else:
-                raise ValueError(f'Unknown moduleEntryId "{module_type}"')
-
-
+        if self._struct_decoding:
+            parsed = _parse_timeline_struct(self, response.content, product)
+        elif self._stream_json:
+            parsed = _parse_timeline_stream(self, response.content, product)
         else:
-            if 'search-grid' in entries:
-                # MEDIA without a cursor
-                cursor_top, cursor_bottom = get_cursors_from_entries(entries)
-                items = optional_chaining(entries['search-grid'][0], 'content', 'items')
-                if not items:
-                    raise ValueError('Items not found in "search-grid"')
-                entry_results = group_entries(items)['search-grid-0-tweet']
-
-            elif 'list-search' in entries:
-                # LIST without a cursor
-                return PaginatedResult._empty()  ## TODO List support
-
-            else:
-                if ('cursor-top' in entries or 'cursor-bottom' in entries):
-                    # LATEST or TOP without a cursor
-                    cursor_top, cursor_bottom = get_cursors_from_entries(entries)
-
-                else:
-                    # LATEST or TOP with a cursor
-                    cursor_top, cursor_bottom = get_cursors_from_replace_entries(
-                        replace_entry_instructions
-                    )
-
-                if product == SearchTimelineProduct.USER:
-                    entry_results = entries['user']
-                else:
-                    entry_results = entries['tweet']
+            parsed = _parse_timeline(self, load_json_response(response), product)
+        if parsed is None:
+            return PaginatedResult._empty()
 
-        items_iter = parse_entries(self, entry_results)
+        items_iter, cursor_top, cursor_bottom = parsed
         ctx = PaginationContext(
             self,
             SearchMixin.search,
@@ -137,6 +332,86 @@ class SearchMixin(BaseMixin):
             query=query,
             product=product,
             count=count,
-            query_source=query_source
+            query_source=query_source,
+            ratelimit_policy=ratelimit_policy,
+            use_cache=use_cache
         )
         return PaginatedResult(items_iter, ctx)
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        product: SearchTimelineProduct,
+        count: int = 20,
+        concurrency: int = 5,
+        pages_per_query: int | None = 1,
+        query_source: SearchTimelineQuerySource = SearchTimelineQuerySource.TYPED,
+        ratelimit_policy: RatelimitPolicy = RatelimitPolicy.WAIT
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Runs many searches concurrently and yields the results as they arrive.
+
+        Parameters
+        ----------
+        queries : Iterable[:class:`str`]
+            The search queries.
+        product : :class:`SearchTimelineProduct`
+            The search product used for every query.
+        count : :class:`int`, default=20
+            Items count to fetch per page.
+        concurrency : :class:`int`, default=5
+            Maximum number of queries being fetched at the same time.
+        pages_per_query : :class:`int` | None, default=1
+            Maximum number of pages fetched per query. None fetches all pages.
+        query_source : :class:`SearchTimelineQuerySource`, default=TYPED
+            The query source used for every query.
+        ratelimit_policy : :class:`RatelimitPolicy`, default=WAIT
+            Rate limit policy of the requests. With WAIT, the queries are held back
+            while the SearchTimeline rate limit is exhausted.
+
+        Yields
+        ------
+        tuple[:class:`str`, :class:`Tweet` | :class:`User`]
+            The query and an item of its results.
+            Items of a query are in page order, queries are interleaved.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a query. The other queries are cancelled.
+        """
+        queries = list(queries)
+        semaphore = asyncio.Semaphore(concurrency)
+        # (query, page, error); page is None when the query is done
+        queue: asyncio.Queue[tuple[str, PaginatedResult | None, Exception | None]] = asyncio.Queue(concurrency)
+
+        async def run(query: str) -> None:
+            try:
+                async with semaphore:
+                    first = await self.search(
+                        query, product, count,
+                        query_source=query_source, ratelimit_policy=ratelimit_policy
+                    )
+                    async with aclosing(first.aiter_pages(max_pages=pages_per_query)) as pages:
+                        async for page in pages:
+                            await queue.put((query, page, None))
+            except Exception as e:
+                await queue.put((query, None, e))
+            else:
+                await queue.put((query, None, None))
+
+        tasks = [asyncio.ensure_future(run(query)) for query in queries]
+        running = len(tasks)
+        try:
+            while running:
+                query, page, error = await queue.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    running -= 1
+                    continue
+                for item in page:
+                    yield query, item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
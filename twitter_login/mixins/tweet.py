@@ -1,10 +1,24 @@
-from ..enums import BatchCompose, ConversationControl
+import asyncio
+from contextlib import aclosing
+from logging import getLogger
+from typing import AsyncIterator, Iterable
+
+import curl_cffi
+
+from ..enums import BatchCompose, ConversationControl, InstructionType, RatelimitPolicy, TweetDetailRankingMode
+from ..errors import HTTPError, ResponseError
+from ..http import load_json_response
 from ..models.tweet import Tweet
 from ..models.uploaded_media import UploadedMedia
-from ..parsers import handle_response_errors
+from ..pagination import PaginatedResult, PaginationContext
+from ..parsers import entry_id_to_type, get_instructions, handle_response_errors, parse_tweet_sharing_user
 from ..utils import optional_chaining
 from .base import BaseMixin
 
+logger = getLogger(__name__)
+
+TWEET_DETAIL_INSTRUCTIONS_PATH = ('data', 'threaded_conversation_with_injections_v2', 'instructions')
+
 
 def build_tweet_media_parameter(media: list[UploadedMedia], tagged_users: list[str]):
     media_entities = []
@@ -22,6 +36,53 @@ def build_tweet_media_parameter(media: list[UploadedMedia], tagged_users: list[s
     }
 
 
+def _parse_tweet_detail(client, payload, users, focal_id=None):
+    """
+    Returns (tweets, cursor-bottom) of a TweetDetail page.
+    The tweets are the focal tweet with its ancestors and the conversation threads in page order,
+    or only the focal tweet if `focal_id` is given.
+    users:
+        Authors already parsed, shared by the tweets of the same author.
+    """
+    handle_response_errors(payload)
+    instructions = get_instructions(payload, *TWEET_DETAIL_INSTRUCTIONS_PATH)
+
+    tweets = []
+    cursor_bottom = None
+    for instruction in instructions.get(InstructionType.TIMELINE_ADD_ENTRIES, []):
+        for entry in instruction.get('entries', []):
+            entry_id = entry.get('entryId', '')
+            type = entry_id_to_type(entry_id)
+            if focal_id is not None:
+                if entry_id == f'tweet-{focal_id}':
+                    payloads = [optional_chaining(entry, 'content', 'itemContent', 'tweet_results', 'result')]
+                else:
+                    continue
+            elif type == 'tweet':
+                payloads = [optional_chaining(entry, 'content', 'itemContent', 'tweet_results', 'result')]
+            elif type == 'conversationthread':
+                # conversationthread-<id>-tweet-<id> items, cursors in the module are skipped
+                payloads = [
+                    optional_chaining(item, 'item', 'itemContent', 'tweet_results', 'result')
+                    for item in optional_chaining(entry, 'content', 'items', default=[])
+                    if entry_id_to_type(item.get('entryId', '')).endswith('-tweet')
+                ]
+            elif type == 'cursor-bottom':
+                cursor_bottom = (
+                    optional_chaining(entry, 'content', 'itemContent', 'value')
+                    or optional_chaining(entry, 'content', 'value')
+                )
+                continue
+            else:
+                continue
+
+            for tweet_payload in payloads:
+                tweet = parse_tweet_sharing_user(client, tweet_payload, users)
+                if tweet is not None:
+                    tweets.append(tweet)
+    return tweets, cursor_bottom
+
+
 class TweetMixin(BaseMixin):
     async def create_tweet(
         self,
@@ -61,9 +122,177 @@ class TweetMixin(BaseMixin):
             conversation_control={'mode': conversation_control} if conversation_control else None
         )
 
-        payload = response.json()
+        payload = load_json_response(response)
         handle_response_errors(payload)
         tweet_payload = optional_chaining(
             payload, 'data', 'create_tweet', 'tweet_results', 'result'
         )
         return Tweet._from_payload(tweet_payload, self)
+
+    async def _fetch_tweet_detail(
+        self,
+        tweet_id: str,
+        cursor: str | None,
+        ranking_mode: TweetDetailRankingMode,
+        ratelimit_policy: RatelimitPolicy | None,
+        users: dict,
+        focal_only: bool = False
+    ) -> tuple[list[Tweet], str | None]:
+        response = await self._api.gql.TweetDetail(
+            focalTweetId=tweet_id,
+            cursor=cursor,
+            referrer='tweet',
+            controller_data=None,
+            rankingMode=ranking_mode,
+            ratelimit_policy=ratelimit_policy
+        )
+        payload = load_json_response(response)
+        return _parse_tweet_detail(self, payload, users, tweet_id if focal_only else None)
+
+    async def get_tweet_detail(
+        self,
+        tweet_id: str,
+        cursor: str | None = None,
+        ranking_mode: TweetDetailRankingMode = TweetDetailRankingMode.RELEVANCE,
+        ratelimit_policy: RatelimitPolicy | None = None
+    ) -> PaginatedResult[Tweet]:
+        """Fetches a page of the conversation of a tweet.
+
+        Parameters
+        ----------
+        tweet_id : :class:`str`
+            The focal tweet ID.
+        cursor : :class:`str` | None, default=None
+            The cursor of the replies page.
+        ranking_mode : :class:`TweetDetailRankingMode`, default=RELEVANCE
+            The order of the replies.
+        ratelimit_policy : :class:`RatelimitPolicy` | None, default=None
+            Overrides the client rate limit policy.
+
+        Returns
+        -------
+        :class:`PaginatedResult`[:class:`Tweet`]
+            The first page has the ancestors, the focal tweet and the first replies.
+            The next pages have the following replies.
+        """
+        tweets, cursor_bottom = await self._fetch_tweet_detail(
+            tweet_id, cursor, ranking_mode, ratelimit_policy, {}
+        )
+        ctx = PaginationContext(
+            self,
+            TweetMixin.get_tweet_detail,
+            None,
+            cursor_bottom,
+            # params
+            tweet_id=tweet_id,
+            ranking_mode=ranking_mode,
+            ratelimit_policy=ratelimit_policy
+        )
+        return PaginatedResult(tweets, ctx)
+
+    async def get_conversation(
+        self,
+        tweet_id: str,
+        max_pages: int | None = None,
+        ranking_mode: TweetDetailRankingMode = TweetDetailRankingMode.RELEVANCE,
+        ratelimit_policy: RatelimitPolicy | None = RatelimitPolicy.WAIT
+    ) -> AsyncIterator[Tweet]:
+        """Iterates over the tweets of the conversation of a tweet.
+
+        The reply pages are followed with the bottom cursor, and the next page
+        is prefetched while the current page is being consumed.
+        Authors are shared within a page; set `identity_map_size` on the client
+        to share them across pages.
+
+        Parameters
+        ----------
+        tweet_id : :class:`str`
+            The focal tweet ID.
+        max_pages : :class:`int` | None, default=None
+            Maximum number of pages to fetch.
+        ranking_mode : :class:`TweetDetailRankingMode`, default=RELEVANCE
+            The order of the replies.
+        ratelimit_policy : :class:`RatelimitPolicy` | None, default=WAIT
+            Rate limit policy of the requests.
+
+        Yields
+        ------
+        :class:`Tweet`
+            The ancestors, the focal tweet, then the replies in page order.
+        """
+        first = await self.get_tweet_detail(
+            tweet_id, ranking_mode=ranking_mode, ratelimit_policy=ratelimit_policy
+        )
+        async with aclosing(first.aiter_items(max_pages=max_pages)) as tweets:
+            async for tweet in tweets:
+                yield tweet
+
+    async def get_tweets(
+        self,
+        tweet_ids: Iterable[str],
+        concurrency: int = 5,
+        ratelimit_policy: RatelimitPolicy | None = RatelimitPolicy.WAIT
+    ) -> AsyncIterator[Tweet]:
+        """Fetches many tweets concurrently and yields them as they arrive.
+
+        One User is parsed per author for the whole batch.
+        Tweets that cannot be fetched (deleted, protected, invalid response, ...)
+        are skipped with a warning.
+
+        Parameters
+        ----------
+        tweet_ids : Iterable[:class:`str`]
+            The tweet IDs. Duplicates are fetched once.
+        concurrency : :class:`int`, default=5
+            Number of workers, i.e. maximum number of requests at the same time.
+        ratelimit_policy : :class:`RatelimitPolicy` | None, default=WAIT
+            Rate limit policy of the requests.
+
+        Yields
+        ------
+        :class:`Tweet`
+            The tweets in the order they are fetched.
+        """
+        users = {}
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for tweet_id in dict.fromkeys(tweet_ids):
+            queue.put_nowait(str(tweet_id))
+        total = queue.qsize()
+        # a fetched tweet, None for a skipped one, or the exception that stops the batch
+        results: asyncio.Queue[Tweet | BaseException | None] = asyncio.Queue()
+
+        async def fetch(tweet_id: str) -> Tweet | None:
+            try:
+                tweets, _ = await self._fetch_tweet_detail(
+                    tweet_id, None, TweetDetailRankingMode.RELEVANCE,
+                    ratelimit_policy, users, focal_only=True
+                )
+            except (ResponseError, HTTPError, ValueError, RuntimeError, curl_cffi.CurlError) as e:
+                logger.warning(f'Failed to fetch tweet {tweet_id}: {e!r}')
+                return None
+            if not tweets:
+                logger.warning(f'Tweet {tweet_id} not found in TweetDetail.')
+                return None
+            return tweets[0]
+
+        async def worker() -> None:
+            while not queue.empty():
+                tweet_id = queue.get_nowait()
+                try:
+                    result = await fetch(tweet_id)
+                except Exception as e:
+                    result = e
+                results.put_nowait(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, total))]
+        try:
+            for _ in range(total):
+                result = await results.get()
+                if isinstance(result, BaseException):
+                    raise result
+                if result is not None:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+DEFAULT_MAXSIZE = 10_000
+
+
+class IdentityMap:
+    """
+    Bounded map of (model type, rest_id) to the shared model instance.
+    Repeated tweets and users resolve to the first parsed instance, whose
+    changing fields (counts, ...) are refreshed from the latest payload,
+    and the least recently used instance is evicted above `maxsize`.
+    """
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive.')
+        self.maxsize = maxsize
+        self._objects: OrderedDict[tuple[type, Hashable], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, type: type, id: Hashable | None) -> Any | None:
+        if id is None:
+            return None
+        key = (type, id)
+        obj = self._objects.get(key)
+        if obj is None:
+            self.misses += 1
+            return None
+        self._objects.move_to_end(key)
+        self.hits += 1
+        return obj
+
+    def refresh(self, type: type, id: Hashable | None, fields: dict[str, Any]) -> Any | None:
+        """
+        Same as :meth:`get`, with `fields` set on the instance found.
+        """
+        obj = self.get(type, id)
+        if obj is not None:
+            for name, value in fields.items():
+                setattr(obj, name, value)
+        return obj
+
+    def add(self, obj: Any, id: Hashable | None) -> None:
+        if id is None:
+            return
+        self._objects[(type(obj), id)] = obj
+        self._objects.move_to_end((type(obj), id))
+        if len(self._objects) > self.maxsize:
+            self._objects.popitem(last=False)
+
+    def clear(self) -> None:
+        self._objects.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        return f'<IdentityMap size={len(self._objects)}/{self.maxsize} hits={self.hits} misses={self.misses}>'
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from logging import getLogger
-from typing import Any, Callable, Generic, Protocol, Type, TypeVar
+from typing import Any, Callable, ClassVar, Generic, Protocol, Type, TypeVar
+
+from ..enums import RetainSources
 
 model_logger = getLogger(__name__ + '.model')
 
@@ -12,6 +14,33 @@ O = TypeVar('O', bound='LazyMixin')
 class LazyMixin:
     _lazy_sources: dict = field(default_factory=dict, init=False)
     _lazy_cache: dict = field(default_factory=dict, init=False)
+    #: Lazy fields materialized instead of dropped by RetainSources.DISCARD.
+    _discard_keeps: ClassVar[tuple[str, ...]] = ()
+
+    def _release_sources(self, policy: RetainSources | None) -> None:
+        """
+        Applies the retain_sources policy to the sources not yet materialized.
+        Nested lazy models are released with the same policy.
+        """
+        if not policy or policy == RetainSources.RETAIN:
+            return
+        if policy == RetainSources.DISCARD:
+            for name in list(self._lazy_sources):
+                if name in self._discard_keeps:
+                    getattr(self, name)
+                else:
+                    del self._lazy_sources[name]
+        elif policy == RetainSources.EAGER:
+            for name in list(self._lazy_sources):
+                # materializing pops the source
+                getattr(self, name)
+        else:
+            raise ValueError(f'Unknown retain_sources policy: "{policy}"')
+
+        for value in self._lazy_cache.values():
+            for v in (value if isinstance(value, list) else (value,)):
+                if isinstance(v, LazyMixin):
+                    v._release_sources(policy)
 
 
 class ModelProtocol(Protocol):
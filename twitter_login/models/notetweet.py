@@ -1,18 +1,27 @@
+from __future__ import annotations
+
 import base64
+from typing import TYPE_CHECKING
 
 from .base import model
 from .lazy import LazyMixin
 from .tweet_entities import TweetEntitiesMixin
 
+if TYPE_CHECKING:
+    from ..client import Client
+
 
 @model(reprs='id')
 class NoteTweet(TweetEntitiesMixin, LazyMixin):
+    # used by the media of the note
+    _client: Client | None = None
     text: str
     id_base64: str
 
     @classmethod
-    def _from_payload(cls, payload):
+    def _from_payload(cls, payload, client: Client | None = None):
         instance = cls(
+            _client=client,
             text=payload.get('text'),
             id_base64=payload.get('id')
         )
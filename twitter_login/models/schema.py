@@ -0,0 +1,125 @@
+"""
+Typed msgspec schemas of the GraphQL timeline responses.
+Decoding a raw body into these skips the intermediate dict tree.
+Unknown fields are ignored; only the subtrees kept as Lazy sources
+(entities, note_tweet, card) are decoded to plain dicts.
+Requires the `msgspec` library.
+"""
+from __future__ import annotations
+
+import msgspec
+
+
+class Struct(msgspec.Struct, gc=False):
+    pass
+
+
+class UserCore(Struct):
+    name: str | None = None
+    screen_name: str | None = None
+    created_at: str | None = None
+
+
+class UserResult(Struct):
+    rest_id: str | None = None
+    core: UserCore = msgspec.field(default_factory=UserCore)
+
+
+class UserResults(Struct):
+    result: UserResult | None = None
+
+
+class TweetCore(Struct):
+    user_results: UserResults = msgspec.field(default_factory=UserResults)
+
+
+class TweetViews(Struct):
+    count: str | None = None
+
+
+class TweetLegacy(Struct):
+    bookmark_count: int | None = None
+    bookmarked: bool | None = None
+    created_at: str | None = None
+    favorite_count: int | None = None
+    favorited: bool | None = None
+    full_text: str | None = None
+    is_quote_status: bool | None = None
+    in_reply_to_screen_name: str | None = None
+    in_reply_to_user_id_str: str | None = None
+    lang: str | None = None
+    quote_count: int | None = None
+    reply_count: int | None = None
+    retweet_count: int | None = None
+    retweeted: bool | None = None
+    user_id_str: str | None = None
+    conversation_id_str: str | None = None
+    entities: dict = {}
+
+
+class TweetResult(Struct):
+    rest_id: str | None = None
+    source: str | None = None
+    legacy: TweetLegacy = msgspec.field(default_factory=TweetLegacy)
+    views: TweetViews = msgspec.field(default_factory=TweetViews)
+    core: TweetCore = msgspec.field(default_factory=TweetCore)
+    note_tweet: dict | None = None
+    card: dict | None = None
+    # TweetWithVisibilityResults
+    tweet: TweetResult | None = None
+
+
+class TweetResults(Struct):
+    result: TweetResult | None = None
+
+
+class ItemContent(Struct):
+    tweet_results: TweetResults = msgspec.field(default_factory=TweetResults)
+    user_results: UserResults = msgspec.field(default_factory=UserResults)
+
+
+class EntryContent(Struct):
+    # cursor value
+    value: str | None = None
+    itemContent: ItemContent | None = None
+    # search-grid items
+    items: list[Entry] | None = None
+
+
+class Entry(Struct):
+    entryId: str | None = None
+    content: EntryContent | None = None
+    # module items have "item" instead of "content"
+    item: EntryContent | None = None
+
+
+class Instruction(Struct):
+    type: str | None = None
+    entries: list[Entry] | None = None
+    entry: Entry | None = None
+    moduleEntryId: str | None = None
+    moduleItems: list[Entry] | None = None
+
+
+class Timeline(Struct):
+    instructions: list[Instruction] | None = None
+
+
+class SearchTimeline(Struct):
+    timeline: Timeline | None = None
+
+
+class SearchByRawQuery(Struct):
+    search_timeline: SearchTimeline | None = None
+
+
+class SearchTimelineData(Struct):
+    search_by_raw_query: SearchByRawQuery | None = None
+
+
+class SearchTimelineResponse(Struct):
+    data: SearchTimelineData | None = None
+    errors: list[dict] | None = None
+
+
+search_timeline_decoder = msgspec.json.Decoder(SearchTimelineResponse)
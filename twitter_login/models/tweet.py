@@ -11,6 +11,7 @@ from .tweet_entities import TweetEntitiesMixin
 from .user import User
 
 if TYPE_CHECKING:
+    from .schema import TweetResult
     from .tweet_entities import URL, Hashtag, Mention, Symbol
     from ..client import Client
 
@@ -59,40 +60,55 @@ class Tweet(TweetEntitiesMixin, LazyMixin):
         User,
         kwargs_factory=lambda x: {'client': x._client}
     )
-    note_tweet: ClassVar[NoteTweet | None] = Lazy(NoteTweet)
+    note_tweet: ClassVar[NoteTweet | None] = Lazy(
+        NoteTweet,
+        kwargs_factory=lambda x: {'client': x._client}
+    )
     card: ClassVar[Card | None] = Lazy(Card)
+    _discard_keeps: ClassVar[tuple[str, ...]] = ('note_tweet',)
 
     @classmethod
     def _from_payload(cls: Type['Tweet'], payload: dict, client: Client, user: User | None = None):
         legacy = payload.get('legacy', {})
         views = payload.get('views', {})
-
-        instance = cls(
-            _client=client,
-            id=payload.get('rest_id'),
+        # the fields that change between responses
+        counts = dict(
             view_count=safe_convert(views.get('count', 0), int),
             bookmark_count=legacy.get('bookmark_count'),
             bookmarked=legacy.get('bookmarked'),
-            created_at=legacy.get('created_at'),
             favorite_count=legacy.get('favorite_count'),
             favorited=legacy.get('favorited'),
+            quote_count=legacy.get('quote_count'),
+            reply_count=legacy.get('reply_count'),
+            retweet_count=legacy.get('retweet_count'),
+            retweeted=legacy.get('retweeted'),
+        )
+
+        if not user:
+            user_payload = optional_chaining(payload, 'core', 'user_results', 'result')
+            user = user_payload and User._from_payload(user_payload, client)
+
+        identity_map = client and client.identity_map
+        if identity_map is not None:
+            cached = identity_map.refresh(cls, payload.get('rest_id'), counts)
+            if cached is not None:
+                return cached
+
+        instance = cls(
+            _client=client,
+            id=payload.get('rest_id'),
+            created_at=legacy.get('created_at'),
             text=legacy.get('full_text'),
             is_quote_status=legacy.get('is_quote_status'),
             in_reply_to_screen_name=legacy.get('in_reply_to_screen_name'),
             in_reply_to_user_id=legacy.get('in_reply_to_user_id_str'),
             lang=legacy.get('lang'),
-            quote_count=legacy.get('quote_count'),
-            reply_count=legacy.get('reply_count'),
-            retweet_count=legacy.get('retweet_count'),
-            retweeted=legacy.get('retweeted'),
             user_id=legacy.get('user_id_str'),
             source=payload.get('source'),
-            conversation_id=legacy.get('conversation_id_str')
+            conversation_id=legacy.get('conversation_id_str'),
+            **counts
         )
 
-        if not user:
-            user = optional_chaining(payload, 'core', 'user_results', 'result')
-
         instance.user = user
 
         note_tweet = optional_chaining(payload, 'note_tweet', 'note_tweet_results', 'result')
@@ -103,6 +119,60 @@ class Tweet(TweetEntitiesMixin, LazyMixin):
         entities = legacy.get('entities', {})
         instance._set_sources_from_entities(entities)
 
+        instance._release_sources(client and client.retain_sources)
+        if identity_map is not None:
+            identity_map.add(instance, instance.id)
+        return instance
+
+    @classmethod
+    def _from_struct(cls: Type['Tweet'], result: TweetResult, client: Client, user: User | None = None):
+        # counterpart of _from_payload for the typed schema
+        legacy = result.legacy
+        counts = dict(
+            view_count=safe_convert(result.views.count or 0, int),
+            bookmark_count=legacy.bookmark_count,
+            bookmarked=legacy.bookmarked,
+            favorite_count=legacy.favorite_count,
+            favorited=legacy.favorited,
+            quote_count=legacy.quote_count,
+            reply_count=legacy.reply_count,
+            retweet_count=legacy.retweet_count,
+            retweeted=legacy.retweeted,
+        )
+
+        if not user:
+            user_result = result.core.user_results.result
+            user = user_result and User._from_struct(user_result, client)
+
+        identity_map = client and client.identity_map
+        if identity_map is not None:
+            cached = identity_map.refresh(cls, result.rest_id, counts)
+            if cached is not None:
+                return cached
+
+        instance = cls(
+            _client=client,
+            id=result.rest_id,
+            created_at=legacy.created_at,
+            text=legacy.full_text,
+            is_quote_status=legacy.is_quote_status,
+            in_reply_to_screen_name=legacy.in_reply_to_screen_name,
+            in_reply_to_user_id=legacy.in_reply_to_user_id_str,
+            lang=legacy.lang,
+            user_id=legacy.user_id_str,
+            source=result.source,
+            conversation_id=legacy.conversation_id_str,
+            **counts
+        )
+
+        instance.user = user
+        instance.note_tweet = optional_chaining(result.note_tweet, 'note_tweet_results', 'result')
+        instance.card = result.card
+        instance._set_sources_from_entities(legacy.entities)
+
+        instance._release_sources(client and client.retain_sources)
+        if identity_map is not None:
+            identity_map.add(instance, instance.id)
         return instance
 
     def __fallback_to_note(self, attr_name):
@@ -6,6 +6,7 @@ from .base import model
 
 if TYPE_CHECKING:
     from ..client import Client
+    from .schema import UserResult
 
 
 @model(reprs='id')
@@ -20,9 +21,40 @@ class User:
     @classmethod
     def _from_payload(cls, payload: dict, client: Client):
         core = payload.get('core', {})
-        return cls(
+        # the profile can change between responses
+        profile = dict(name=core.get('name'), screen_name=core.get('screen_name'))
+
+        identity_map = client and client.identity_map
+        if identity_map is not None:
+            cached = identity_map.refresh(cls, payload.get('rest_id'), profile)
+            if cached is not None:
+                return cached
+
+        instance = cls(
             id=payload.get('rest_id'),
-            name=core.get('name'),
-            screen_name=core.get('screen_name'),
             created_at=core.get('created_at'),
+            **profile
+        )
+        if identity_map is not None:
+            identity_map.add(instance, instance.id)
+        return instance
+
+    @classmethod
+    def _from_struct(cls, result: UserResult, client: Client):
+        core = result.core
+        profile = dict(name=core.name, screen_name=core.screen_name)
+
+        identity_map = client and client.identity_map
+        if identity_map is not None:
+            cached = identity_map.refresh(cls, result.rest_id, profile)
+            if cached is not None:
+                return cached
+
+        instance = cls(
+            id=result.rest_id,
+            created_at=core.created_at,
+            **profile
         )
+        if identity_map is not None:
+            identity_map.add(instance, instance.id)
+        return instance
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+from contextlib import aclosing
 from hashlib import md5
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Generic, Iterable, Iterator, TypeVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Generic, Iterable, Iterator, Sequence, TypeVar
+
+from .export import DEFAULT_BATCH_SIZE, iter_batches
 
 if TYPE_CHECKING:
     from .client import Client
@@ -10,6 +17,32 @@ if TYPE_CHECKING:
 T = TypeVar('T')
 
 
+class FileCheckpointStore:
+    """
+    Stores a pagination state in a file.
+    The file is replaced atomically so a crash never leaves a partial state.
+    """
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def save(self, state: bytes) -> None:
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_bytes(state)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> bytes | None:
+        try:
+            return self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def __repr__(self) -> str:
+        return f'<FileCheckpointStore path="{self.path}">'
+
+
 class PaginationContext:
     """
     :meta private:
@@ -29,6 +62,44 @@ class PaginationContext:
         self.next_cursor = next_cursor
         self.params = params
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'method': self.method.__name__,
+            'params': self.params,
+            'previous_cursor': self.previous_cursor,
+            'next_cursor': self.next_cursor
+        }
+
+    @classmethod
+    def from_dict(cls, instance: Client, data: dict[str, Any]) -> PaginationContext:
+        name = data.get('method')
+        if not isinstance(name, str) or name.startswith('_'):
+            raise ValueError(f'Invalid pagination method: "{name}"')
+        method = getattr(type(instance), name, None)
+        if not asyncio.iscoroutinefunction(method):
+            raise ValueError(f'Invalid pagination method: "{name}"')
+        return cls(
+            instance,
+            method,
+            data.get('previous_cursor'),
+            data.get('next_cursor'),
+            **data.get('params', {})
+        )
+
+
+async def resume_pagination(instance: Client, state: bytes | str) -> PaginatedResult:
+    """
+    Returns the page following the page the state was saved from.
+    """
+    try:
+        data = json.loads(state)
+    except json.JSONDecodeError as e:
+        raise ValueError('Invalid pagination state.') from e
+    if not isinstance(data, dict):
+        raise ValueError('Invalid pagination state.')
+    context = PaginationContext.from_dict(instance, data)
+    return await PaginatedResult([], context).next()
+
 
 class PaginatedResult(Generic[T]):
     def __init__(
@@ -52,6 +123,16 @@ class PaginatedResult(Generic[T]):
     def next_cursor(self) -> str | None:
         return self.__context and self.__context.next_cursor
 
+    def to_state(self) -> bytes:
+        """
+        Serializes the pagination context to a compact JSON blob.
+        Pass it to :meth:`Client.resume` to continue from the next page.
+        """
+        if not self.__context:
+            raise ValueError('Empty result has no pagination state.')
+        return json.dumps(
+            self.__context.to_dict(), separators=(',', ':'), ensure_ascii=False
+        ).encode()
 
     async def previous(self, **kwargs) -> PaginatedResult[T]:
         """
@@ -83,6 +164,144 @@ class PaginatedResult(Generic[T]):
         }
         return await context.method(context.instance, **params)
 
+    async def aiter_pages(
+        self,
+        max_pages: int | None = None,
+        checkpoint: str | Path | FileCheckpointStore | None = None,
+        checkpoint_every: int = 1,
+        **kwargs
+    ) -> AsyncIterator[PaginatedResult[T]]:
+        """Iterates over the pages starting from this page.
+
+        The next page is prefetched while the current page is being consumed.
+        The iteration stops at an empty page, a repeated cursor or `max_pages`.
+
+        Parameters
+        ----------
+        max_pages : :class:`int` | None, default=None
+            Maximum number of pages to yield, including this page.
+        checkpoint : :class:`str` | :class:`Path` | :class:`FileCheckpointStore` | None, default=None
+            Where to save the state of the last consumed page.
+            The crawl can be continued with :meth:`Client.resume`.
+        checkpoint_every : :class:`int`, default=1
+            Saves the state every N consumed pages.
+            The last consumed page is always saved when the iteration ends.
+        **kwargs
+            Passed to :meth:`next`.
+        """
+        if checkpoint is not None and not isinstance(checkpoint, FileCheckpointStore):
+            checkpoint = FileCheckpointStore(checkpoint)
+        page = self
+        seen_cursors = set()
+        count = 0
+        prefetch = None
+        unsaved = None
+        try:
+            while True:
+                if not page._materialize():
+                    return
+                count += 1
+
+                cursor = page.next_cursor
+                if (
+                    cursor and cursor not in seen_cursors
+                    and (max_pages is None or count < max_pages)
+                ):
+                    seen_cursors.add(cursor)
+                    prefetch = asyncio.ensure_future(page.next(**kwargs))
+
+                yield page
+
+                if checkpoint is not None and page.__context:
+                    unsaved = page
+                    if count % checkpoint_every == 0:
+                        checkpoint.save(page.to_state())
+                        unsaved = None
+                if prefetch is None:
+                    return
+                page = await prefetch
+                prefetch = None
+        finally:
+            if prefetch is not None:
+                prefetch.cancel()
+            if unsaved is not None:
+                checkpoint.save(unsaved.to_state())
+
+    async def aiter_items(
+        self,
+        limit: int | None = None,
+        max_pages: int | None = None,
+        checkpoint: str | Path | FileCheckpointStore | None = None,
+        checkpoint_every: int = 1,
+        **kwargs
+    ) -> AsyncIterator[T]:
+        """Iterates over the items of the pages starting from this page.
+
+        Parameters
+        ----------
+        limit : :class:`int` | None, default=None
+            Maximum number of items to yield.
+        max_pages : :class:`int` | None, default=None
+            Maximum number of pages to fetch, including this page.
+        checkpoint : :class:`str` | :class:`Path` | :class:`FileCheckpointStore` | None, default=None
+            See :meth:`aiter_pages`.
+        checkpoint_every : :class:`int`, default=1
+            See :meth:`aiter_pages`.
+        **kwargs
+            Passed to :meth:`next`.
+        """
+        if limit is not None and limit <= 0:
+            return
+        count = 0
+        async with aclosing(
+            self.aiter_pages(max_pages, checkpoint, checkpoint_every, **kwargs)
+        ) as pages:
+            async for page in pages:
+                for item in page:
+                    yield item
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+
+    async def to_batches(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Sequence[str] | None = None,
+        limit: int | None = None,
+        max_pages: int | None = None,
+        **kwargs
+    ) -> AsyncIterator[dict[str, list]]:
+        """Iterates over the items of the pages starting from this page as columnar batches.
+
+        Each batch is a dict of column name to values with at most `batch_size` rows,
+        so a long crawl can be flushed incrementally (see :mod:`twitter_login.export`).
+
+        Parameters
+        ----------
+        batch_size : :class:`int`, default=1000
+            Maximum number of rows per batch.
+        columns : Sequence[:class:`str`] | None, default=None
+            Attributes to export. Defaults to the columns of the item type.
+        limit : :class:`int` | None, default=None
+            Maximum number of items.
+        max_pages : :class:`int` | None, default=None
+            Maximum number of pages to fetch, including this page.
+        **kwargs
+            Passed to :meth:`aiter_items`.
+        """
+        async with aclosing(self.aiter_items(limit, max_pages, **kwargs)) as items:
+            async with aclosing(iter_batches(items, batch_size, columns)) as batches:
+                async for batch in batches:
+                    yield batch
+
+    def _materialize(self) -> list[T]:
+        """
+        Consumes the items iterator so the items can be iterated more than once.
+        """
+        if not isinstance(self.__items_iter, list):
+            self.__items_iter = list(self.__items_iter)
+        return self.__items_iter
+
     @classmethod
     def _empty(cls):
         return cls([])
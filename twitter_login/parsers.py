@@ -1,8 +1,9 @@
 from collections import defaultdict
 from functools import wraps
 from logging import getLogger
-from typing import Callable
+from typing import Callable, Iterator
 
+from .enums import InstructionType
 from .errors import ResponseError
 from .models import Tweet, User
 from .utils import optional_chaining
@@ -30,6 +31,101 @@ def get_instructions(response: dict, *path_to_instructions) -> dict[str, list[di
     return group_instructions(instructions)
 
 
+def get_instructions_stream(data: bytes, *path_to_instructions) -> dict[str, list[dict]]:
+    """
+    Incremental counterpart of get_instructions for a raw response body.
+    Raises the same errors as handle_response_errors and get_instructions.
+    The `entries` of TimelineAddEntries and the `moduleItems` of TimelineAddToModule
+    are not built: they are replaced by iterators that build one entry at a time
+    from the body. An iterator yields the items of that key in all the instructions,
+    a response has at most one instruction of each of these types.
+    Requires the `ijson` library.
+    path_to_instructions:
+        A sequence of keys to navigate to the instructions.
+    """
+    try:
+        import ijson
+    except ModuleNotFoundError:
+        raise ImportError(
+            'The "ijson" library is required to parse responses incrementally. '
+            'Please install ijson or disable "stream_json".'
+        )
+
+    prefix = '.'.join(path_to_instructions) + '.item'
+    streamed = {
+        f'{prefix}.entries': 'entries',
+        f'{prefix}.moduleItems': 'moduleItems'
+    }
+
+    # The first pass only builds the errors and the small instructions.
+    # The entry lists are skipped and built one entry at a time by ijson.items,
+    # which builds objects in C when the yajl2_c backend is available.
+    errors = None
+    instructions = []
+    events = ijson.parse(data, use_float=True)
+    for current, event, value in events:
+        if event != 'start_map' and event != 'start_array':
+            continue
+        if current == 'errors':
+            errors = _build_value(ijson, events, event, value)
+        elif current == prefix:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            found = []
+            for current, event, value in events:
+                if current in streamed:
+                    # the map_key event of the list is already built
+                    found.append(current)
+                    _skip_value(events, event)
+                    continue
+                builder.event(event, value)
+                if current == prefix and event == 'end_map':
+                    break
+            instruction = builder.value
+            for path in found:
+                instruction[streamed[path]] = ijson.items(data, f'{path}.item', use_float=True)
+            instructions.append(instruction)
+
+    if errors:
+        raise ResponseError(errors)
+    if not instructions:
+        raise ValueError('instructions not found in response.')
+    return group_instructions(instructions)
+
+
+def _build_value(ijson, events, event, value):
+    """
+    Builds the object starting at the current event from the following events.
+    """
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    while True:
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+        _, event, value = next(events)
+
+
+def _skip_value(events, event):
+    """
+    Consumes the events of the value starting at the current event.
+    """
+    if event not in ('start_map', 'start_array'):
+        return
+    depth = 1
+    for _, event, _ in events:
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+            if depth == 0:
+                return
+
+
 def group_list_by_key(l: list[dict], key: Callable) -> dict[str, list[dict]]:
     """
     Groups dicts by a specific key.
@@ -139,6 +235,32 @@ def _parse_tweet_base(client, payload):
     return Tweet._from_payload(payload, client)
 
 
+def parse_tweet_sharing_user(client, payload, users: dict[str, User]):
+    """
+    Parses a tweet payload, reusing the User in `users` for a known author.
+    Returns None for tombstones (deleted or withheld tweets).
+    """
+    if not payload:
+        logger.warning('Failed to parse a tweet. Tweet data not found.')
+        return
+
+    if 'tweet' in payload:
+        # handle TweetWithVisibilityResults
+        payload = payload['tweet']
+    if 'rest_id' not in payload:
+        logger.info(f'Skipped a tweet without data ({payload.get("__typename")}).')
+        return
+
+    user = None
+    user_payload = optional_chaining(payload, 'core', 'user_results', 'result')
+    user_id = user_payload and user_payload.get('rest_id')
+    if user_id is not None:
+        user = users.get(user_id)
+        if user is None:
+            user = users[user_id] = User._from_payload(user_payload, client)
+    return Tweet._from_payload(payload, client, user)
+
+
 @register_parser('tweet')
 def parse_tweet(client, entry):
     payload = optional_chaining(
@@ -190,6 +312,67 @@ def parse_entries(client, entries):
         yield parsed
 
 
+def decode_search_timeline(data: bytes):
+    """
+    Decodes a raw SearchTimeline response into the typed schema (models.schema).
+    Returns None if the response does not match the schema.
+    Raises RuntimeError like load_json_response if the body is not valid JSON.
+    Requires the `msgspec` library.
+    """
+    try:
+        import msgspec
+    except ModuleNotFoundError:
+        raise ImportError(
+            'The "msgspec" library is required to decode responses into structs. '
+            'Please install msgspec or disable "struct_decoding".'
+        )
+    from .models.schema import search_timeline_decoder
+
+    try:
+        return search_timeline_decoder.decode(data)
+    except msgspec.ValidationError as e:
+        logger.warning(f'Response does not match the schema: {e}. Falling back to dict decoding.')
+        return None
+    except msgspec.DecodeError as e:
+        # ValidationError is a DecodeError, this is a malformed body
+        body = data[:200].decode(errors='replace')
+        raise RuntimeError(f'Invalid JSON response. Body: {body}') from e
+
+
+def parse_struct_entries(client, entries):
+    """
+    Counterpart of parse_entries for the typed schema entries.
+    Yields parsed entry object.
+    """
+    for entry in entries:
+        if not entry.entryId:
+            logger.info('EntryId not found. Skipped an entry.')
+            continue
+        type = entry_id_to_type(entry.entryId)
+        content = entry.content or entry.item
+        item_content = content and content.itemContent
+
+        if type in ('tweet', 'search-grid-0-tweet'):
+            result = item_content and item_content.tweet_results.result
+            if result is None:
+                logger.warning('Failed to parse a tweet entry. Tweet data not found.')
+                continue
+            if result.tweet is not None:
+                # handle TweetWithVisibilityResults
+                result = result.tweet
+            yield Tweet._from_struct(result, client)
+
+        elif type == 'user':
+            result = item_content and item_content.user_results.result
+            if result is None:
+                logger.warning('Failed to parse a user entry. User data not found.')
+                continue
+            yield User._from_struct(result, client)
+
+        else:
+            logger.info(f'The parser for entry type "{type}" is not registered. Skipped an entry.')
+
+
 def handle_response_errors(response):
     """
     Handles the 'errors' key in response.
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
+
+from .enums import RatelimitPolicy, SearchTimelineProduct
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .models.tweet import Tweet
+    from .pagination import PaginatedResult
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class QueryState:
+    #: The newest tweet ID seen for the query.
+    newest_id: int | None = None
+    #: The top cursor of the newest page, used to fetch only newer tweets.
+    top_cursor: str | None = None
+    #: Seconds to wait before the next poll.
+    interval: float = 0.0
+    #: Smoothed number of new tweets per second.
+    rate: float | None = None
+    last_poll: float | None = None
+    next_poll: float = 0.0
+
+
+class SearchPoller:
+    """
+    Polls search queries and returns only the tweets not seen yet.
+
+    The first poll of a query fetches the first page. The next polls
+    fetch the pages above the top cursor with :meth:`PaginatedResult.previous`
+    and stop as soon as a known tweet ID is reached.
+    The poll interval of each query adapts to its rate of new tweets.
+    The searches bypass the response cache of the client.
+
+    Parameters
+    ----------
+    client : :class:`Client`
+        The client used for the searches.
+    product : :class:`SearchTimelineProduct`, default=LATEST
+        The search product.
+    count : :class:`int`, default=20
+        Items count to fetch per page.
+    min_interval : :class:`float`, default=30
+        Minimum seconds between two polls of a query.
+    max_interval : :class:`float`, default=900
+        Maximum seconds between two polls of a query.
+    max_pages : :class:`int`, default=5
+        Maximum number of newer pages fetched per poll.
+    ratelimit_policy : :class:`RatelimitPolicy`, default=WAIT
+        Rate limit policy of the search requests.
+    """
+    #: Weight of the latest poll in the smoothed rate.
+    SMOOTHING = 0.5
+    #: Interval multiplier after a poll without new tweets.
+    BACKOFF = 1.5
+
+    def __init__(
+        self,
+        client: Client,
+        product: SearchTimelineProduct = SearchTimelineProduct.LATEST,
+        count: int = 20,
+        min_interval: float = 30,
+        max_interval: float = 900,
+        max_pages: int = 5,
+        ratelimit_policy: RatelimitPolicy = RatelimitPolicy.WAIT
+    ) -> None:
+        if min_interval > max_interval:
+            raise ValueError('min_interval must not be greater than max_interval.')
+        self.client = client
+        self.product = product
+        self.count = count
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_pages = max_pages
+        self.ratelimit_policy = ratelimit_policy
+        self.states: dict[str, QueryState] = {}
+
+    def state(self, query: str) -> QueryState:
+        if query not in self.states:
+            self.states[query] = QueryState(interval=self.min_interval)
+        return self.states[query]
+
+    async def _search(self, query: str, cursor: str | None = None) -> PaginatedResult[Tweet]:
+        return await self.client.search(
+            query, self.product, self.count, cursor,
+            ratelimit_policy=self.ratelimit_policy, use_cache=False
+        )
+
+    async def poll(self, query: str) -> list[Tweet]:
+        """
+        Returns the tweets of the query newer than the last poll, in the page order.
+        """
+        state = self.state(query)
+        now = time.monotonic()
+        first_poll = state.top_cursor is None
+        page = await self._search(query, state.top_cursor)
+
+        new = []
+        pages = 1
+        while True:
+            items = page._materialize()
+            reached_known = False
+            for tweet in items:
+                if tweet.id is None:
+                    # no ID to compare with (e.g. an unavailable tweet)
+                    continue
+                if state.newest_id is not None and int(tweet.id) <= state.newest_id:
+                    reached_known = True
+                    continue
+                new.append(tweet)
+            if page.previous_cursor:
+                state.top_cursor = page.previous_cursor
+
+            if first_poll or reached_known or not items or pages >= self.max_pages:
+                break
+            page = await page.previous()
+            pages += 1
+
+        if new:
+            state.newest_id = max(state.newest_id or 0, *(int(t.id) for t in new))
+        self._update_interval(state, len(new), now, first_poll)
+        logger.info(
+            f'Polled "{query}": {len(new)} new tweets in {pages} pages. '
+            f'Next poll in {state.interval:.0f} seconds.'
+        )
+        return new
+
+    def _update_interval(self, state: QueryState, new_count: int, now: float, first_poll: bool) -> None:
+        """
+        Sets the interval so that a poll returns about half a page of new tweets.
+        """
+        if not first_poll and state.last_poll is not None:
+            rate = new_count / max(now - state.last_poll, 1e-3)
+            if state.rate is None:
+                state.rate = rate
+            else:
+                state.rate = self.SMOOTHING * rate + (1 - self.SMOOTHING) * state.rate
+
+            if new_count == 0:
+                interval = state.interval * self.BACKOFF
+            else:
+                interval = (self.count / 2) / state.rate
+            state.interval = min(max(interval, self.min_interval), self.max_interval)
+        state.last_poll = now
+        state.next_poll = now + state.interval
+
+    async def run(self, queries: Iterable[str]) -> AsyncIterator[tuple[str, Tweet]]:
+        """
+        Polls the queries forever, each at its own interval,
+        and yields (query, tweet) for each new tweet.
+        """
+        queries = list(queries)
+        if not queries:
+            return
+        while True:
+            for query in queries:
+                if self.state(query).next_poll <= time.monotonic():
+                    for tweet in await self.poll(query):
+                        yield query, tweet
+            delay = min(self.state(q).next_poll for q in queries) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def __repr__(self) -> str:
+        return f'<SearchPoller queries={len(self.states)}>'
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
+
+from .client import Client
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .gql_endpoints.endpoint import GQLState
+    from .headers import UserAgent
+    from .models.tweet import Tweet
+    from .pagination import PaginatedResult
+
+logger = getLogger(__name__)
+
+
+class ClientPool:
+    """
+    A pool of logged-in clients.
+    Each request is routed to the account with the most remaining rate limit
+    for the endpoint being called. Accounts whose circuit for the endpoint host
+    is open (see :class:`CircuitBreaker`) are skipped while others are available.
+
+    All clients in the pool share one GraphQL endpoints state, so the
+    endpoints are fetched only once by the first loaded client.
+
+    Parameters
+    ----------
+    user_agent : :class:`UserAgent`
+        User agent used by every client in the pool.
+    impersonate : :class:`str`
+        Browser to impersonate.
+    """
+    def __init__(self, user_agent: UserAgent, impersonate: str, *args, **kwargs) -> None:
+        self.user_agent = user_agent
+        self.impersonate = impersonate
+        self._args = args
+        self._kwargs = kwargs
+        self.clients: list[Client] = []
+        self._gql_state: GQLState | None = None
+        self._in_flight: dict[int, int] = {}
+        self._last_used: dict[int, int] = {}
+        self._counter = itertools.count()
+
+    def _new_client(self) -> Client:
+        client = Client(
+            self.user_agent, self.impersonate, *self._args,
+            gql_state=self._gql_state, **self._kwargs
+        )
+        if self._gql_state is None:
+            self._gql_state = client._gql_endpoints_manager.state
+        return client
+
+    def add_client(self, client: Client) -> None:
+        """
+        Adds an already logged-in client to the pool.
+        """
+        self.clients.append(client)
+        self._in_flight[id(client)] = 0
+        self._last_used[id(client)] = -1
+
+    async def load_cookies(
+        self,
+        cookies_list: Iterable[str | Path | dict[str, str]],
+        *,
+        validate_cookies: bool = True,
+        concurrency: int = 5
+    ) -> None:
+        """Creates a client for each cookies and adds it to the pool.
+
+        The GraphQL endpoints are updated only by the first client
+        when the pool is empty. The other clients reuse the shared state.
+        Cookies that fail to load are skipped with a warning
+        and the session of their client is closed.
+
+        Parameters
+        ----------
+        cookies_list : Iterable[:class:`str` | :class:`Path` | dict[:class:`str`, :class:`str`]]
+            Paths to cookies JSON files, or dictionaries of cookies.
+        validate_cookies : :class:`bool`, default=True
+            Whether to validate cookie authentication.
+        concurrency : :class:`int`, default=5
+            Maximum number of clients logging in at the same time.
+
+        Raises
+        ------
+        Exception
+            The error of the first failed cookies, if the pool is still empty.
+        """
+        cookies_list = list(cookies_list)
+        if not cookies_list:
+            return
+        total = len(cookies_list)
+        errors: list[BaseException] = []
+
+        async def load(cookies, update_gql_endpoints: bool) -> Client:
+            client = self._new_client()
+            try:
+                await client.load_cookies(
+                    cookies,
+                    update_gql_endpoints=update_gql_endpoints,
+                    validate_cookies=validate_cookies
+                )
+            except BaseException:
+                await client.close()
+                raise
+            return client
+
+        def failed(index: int, error: BaseException) -> None:
+            # the cookies themselves are secrets, only their position is logged
+            logger.warning(f'Failed to load cookies #{index}: {error!r}')
+            errors.append(error)
+
+        index = 0
+        while not self.clients and index < total:
+            try:
+                self.add_client(await load(cookies_list[index], True))
+            except Exception as e:
+                failed(index, e)
+            index += 1
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def load_limited(cookies) -> Client:
+            async with sem:
+                return await load(cookies, False)
+
+        results = await asyncio.gather(
+            *(load_limited(c) for c in cookies_list[index:]),
+            return_exceptions=True
+        )
+        for i, result in enumerate(results, index):
+            if isinstance(result, BaseException):
+                failed(i, result)
+            else:
+                self.add_client(result)
+
+        if errors:
+            logger.warning(f'{len(errors)} of {total} cookies failed to load.')
+            if not self.clients:
+                raise errors[0]
+        logger.info(f'{len(self.clients)} clients loaded.')
+
+    def _endpoint_url(self, operation_name: str) -> str | None:
+        if self._gql_state is None:
+            return
+        endpoint = self._gql_state.endpoints.get(operation_name)
+        return endpoint and endpoint.url
+
+    def _score(self, client: Client, url: str | None):
+        in_flight = self._in_flight[id(client)]
+        ratelimit = url and client.ratelimits.get(url)
+        # unknown rate limits are preferred so every account gets probed
+        remaining = ratelimit.current_remaining() if ratelimit else float('inf')
+        return remaining - in_flight, -in_flight, -self._last_used[id(client)]
+
+    def pick(self, operation_name: str) -> Client:
+        """
+        Returns the client with the most remaining rate limit for the endpoint.
+        Ties are broken by the number of in-flight requests, then by
+        the least recently used client.
+        Clients whose circuit for the endpoint host is open are picked only
+        if no other client is available.
+        """
+        if not self.clients:
+            raise RuntimeError('No clients in the pool. Call `load_cookies` first.')
+        url = self._endpoint_url(operation_name)
+        clients = self.clients
+        if url:
+            clients = [c for c in self.clients if c.is_host_available(url)] or self.clients
+        return max(clients, key=lambda c: self._score(c, url))
+
+    @asynccontextmanager
+    async def acquire(self, operation_name: str) -> AsyncIterator[Client]:
+        """
+        Picks a client for the endpoint and marks it as in use while the block runs.
+        """
+        client = self.pick(operation_name)
+        key = id(client)
+        self._in_flight[key] += 1
+        self._last_used[key] = next(self._counter)
+        try:
+            yield client
+        finally:
+            self._in_flight[key] -= 1
+
+    async def search(self, *args, **kwargs) -> PaginatedResult:
+        """
+        :meth:`Client.search` routed to the least rate limited account.
+        The next pages are fetched with the same account.
+        """
+        async with self.acquire('SearchTimeline') as client:
+            return await client.search(*args, **kwargs)
+
+    async def create_tweet(self, *args, **kwargs) -> Tweet:
+        """
+        :meth:`Client.create_tweet` routed to the least rate limited account.
+        """
+        async with self.acquire('CreateTweet') as client:
+            return await client.create_tweet(*args, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def __repr__(self) -> str:
+        return f'<ClientPool clients={len(self.clients)}>'
@@ -1,8 +1,19 @@
+import asyncio
 import time
+from collections import defaultdict
 from dataclasses import dataclass
+from logging import getLogger
 from urllib.parse import urlparse
 from curl_cffi import Headers
 
+from .enums import RatelimitPolicy
+from .errors import RatelimitExceeded
+
+logger = getLogger(__name__)
+
+# seconds to wait after the reset time to absorb clock skew
+RESET_MARGIN = 1.0
+
 
 @dataclass(frozen=True)
 class Ratelimit:
@@ -38,6 +49,13 @@ def normalize_url(url: str):
     return hostname
 
 
+def normalize_host(url: str):
+    normalized_url = normalize_url(url)
+    if not normalized_url:
+        return
+    return normalized_url.split('/', 1)[0]
+
+
 class RatelimitsManager:
     def __init__(self) -> None:
         self.ratelimits: dict[str, Ratelimit] = {}
@@ -73,3 +91,63 @@ class RatelimitsManager:
 
     def __repr__(self) -> str:
         return repr(self.ratelimits)
+
+
+class RatelimitScheduler:
+    """
+    Holds requests back until the rate limit of the endpoint allows them.
+    Requests waiting for the same endpoint are released in FIFO order.
+    """
+    def __init__(self, manager: RatelimitsManager) -> None:
+        self.manager = manager
+        self._locks: dict[str, asyncio.Lock] = {}
+        # requests sent but whose rate limit headers are not received yet
+        self._pending: dict[str, int] = defaultdict(int)
+
+    def _delay(self, key: str) -> float:
+        """
+        Returns seconds to wait before sending a request, 0 if it can be sent now.
+        """
+        ratelimit = self.manager.ratelimits.get(key)
+        if not ratelimit or ratelimit.is_reset():
+            return 0
+        if ratelimit.remaining - self._pending[key] > 0:
+            return 0
+        return max(ratelimit.reset - time.time(), 0) + RESET_MARGIN
+
+    async def acquire(self, url, policy: RatelimitPolicy) -> str | None:
+        """
+        Waits or raises according to the policy if the endpoint is rate limited.
+        Returns a key which must be passed to :meth:`release` after the response.
+        """
+        key = normalize_url(url)
+        if policy == RatelimitPolicy.IGNORE or not key:
+            return
+
+        if policy == RatelimitPolicy.RAISE:
+            if self._delay(key) > 0:
+                raise RatelimitExceeded(url, self.manager.ratelimits[key].reset)
+            self._pending[key] += 1
+            return key
+
+        # asyncio.Lock wakes up waiters in FIFO order.
+        # Only the head of the queue sleeps until the reset time.
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            while (delay := self._delay(key)) > 0:
+                logger.info(f'Rate limited: {key}. Waiting {delay:.1f} seconds.')
+                await asyncio.sleep(delay)
+            self._pending[key] += 1
+        return key
+
+    def release(self, key: str | None) -> None:
+        if key is None:
+            return
+        self._pending[key] -= 1
+
+    async def wait(self, url) -> None:
+        """
+        Waits until a request to the url can be sent without reserving it.
+        """
+        key = await self.acquire(url, RatelimitPolicy.WAIT)
+        self.release(key)
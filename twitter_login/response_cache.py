@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from logging import getLogger
+from pathlib import Path
+
+logger = getLogger(__name__)
+
+DEFAULT_MAXSIZE = 1000
+DEFAULT_COMMIT_EVERY = 100
+DEFAULT_COMMIT_INTERVAL = 5.0
+#: Twitter snowflake epoch in milliseconds.
+SNOWFLAKE_EPOCH = 1288834974657
+
+
+def snowflake_age(id: str | int) -> float | None:
+    """
+    Returns the age in seconds of a tweet/user ID, or None if it is not a snowflake.
+    """
+    try:
+        timestamp = ((int(id) >> 22) + SNOWFLAKE_EPOCH) / 1000
+    except (TypeError, ValueError):
+        return None
+    return time.time() - timestamp
+
+
+def search_timeline_ttl(variables: dict) -> float:
+    # new tweets keep coming for the latest results
+    return 60 if variables.get('product') == 'Latest' else 300
+
+
+def tweet_detail_ttl(variables: dict) -> float:
+    # the conversation of an old tweet rarely changes
+    age = snowflake_age(variables.get('focalTweetId'))
+    if age is not None and age > 86400:
+        return 3600
+    return 60
+
+
+def make_key(
+    account_id: str | None,
+    query_id: str,
+    operation: str,
+    variables_json: str | None,
+    features_json: str | None,
+    field_toggles_json: str | None
+) -> str:
+    """
+    account_id:
+        None for a guest. Responses depend on the viewer (favorited, blocked users, ...).
+    query_id, features_json:
+        A new query ID or feature switches change the response schema.
+    """
+    key = f'{account_id}\n{query_id}\n{operation}\n{variables_json}\n{features_json}\n{field_toggles_json}'
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Base class of the response cache backends.
+    Entries are the raw response bodies with an expiration time.
+    """
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        content = self._get(key, time.time())
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    def set(self, key: str, content: bytes, ttl: float) -> None:
+        self._set(key, content, time.time() + ttl)
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> bytes | None:
+        """
+        Returns the content of the entry, or None if it is missing or expired at `now`.
+        """
+
+    @abstractmethod
+    def _set(self, key: str, content: bytes, expires: float) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    In-memory LRU cache of at most `maxsize` responses.
+    """
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        super().__init__()
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive.')
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, content = entry
+        if expires <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return content
+
+    def _set(self, key: str, content: bytes, expires: float) -> None:
+        self._entries[key] = (expires, content)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'<MemoryResponseCache size={len(self._entries)}/{self.maxsize} hits={self.hits} misses={self.misses}>'
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache in a local SQLite file, kept across restarts.
+    Expired entries are removed on access and by :meth:`purge`.
+
+    The lookups run on the calling thread (the event loop), so the writes are
+    not committed one by one: they are committed every `commit_every` writes
+    or `commit_interval` seconds, and by :meth:`flush` and :meth:`close`.
+    Writes not committed yet are visible to the lookups but lost if the
+    process exits without :meth:`close`.
+    """
+    def __init__(
+        self,
+        path: str | Path,
+        commit_every: int = DEFAULT_COMMIT_EVERY,
+        commit_interval: float = DEFAULT_COMMIT_INTERVAL
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True)
+        self._connection = sqlite3.connect(self.path)
+        # WAL commits append to the log instead of rewriting the database
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL NOT NULL, content BLOB NOT NULL)'
+        )
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._connection.commit()
+        self.purge()
+
+    def _written(self) -> None:
+        self._pending += 1
+        if (
+            self._pending >= self.commit_every
+            or time.monotonic() - self._last_commit >= self.commit_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Commits the pending writes.
+        """
+        self._connection.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def _get(self, key: str, now: float) -> bytes | None:
+        row = self._connection.execute(
+            'SELECT expires, content FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[0] <= now:
+            self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._written()
+            return None
+        return row[1]
+
+    def _set(self, key: str, content: bytes, expires: float) -> None:
+        self._connection.execute(
+            'INSERT OR REPLACE INTO responses (key, expires, content) VALUES (?, ?, ?)',
+            (key, expires, content)
+        )
+        self._written()
+
+    def purge(self) -> None:
+        """
+        Removes the expired entries.
+        """
+        cursor = self._connection.execute('DELETE FROM responses WHERE expires <= ?', (time.time(),))
+        self.flush()
+        if cursor.rowcount:
+            logger.info(f'Purged {cursor.rowcount} expired responses from {self.path}')
+
+    def clear(self) -> None:
+        self._connection.execute('DELETE FROM responses')
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def __repr__(self) -> str:
+        return f'<SQLiteResponseCache path="{self.path}" hits={self.hits} misses={self.misses}>'
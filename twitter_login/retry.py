@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from .ratelimits import RESET_MARGIN
+
+if TYPE_CHECKING:
+    from curl_cffi import Headers
+
+logger = getLogger(__name__)
+
+#: Statuses of transient failures.
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+#: Methods that can be sent again without side effects.
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+@dataclass
+class RetryStats:
+    #: Requests sent (first attempts).
+    requests: int = 0
+    #: Attempts sent, including the retries.
+    attempts: int = 0
+    retries: int = 0
+    #: Retries denied because the host retry budget was exhausted.
+    budget_exhausted: int = 0
+    #: Total seconds waited before retries.
+    wait_time: float = 0.0
+
+
+class RetryBudget:
+    """
+    Per-host token bucket limiting retries to a ratio of the requests,
+    so that retries do not amplify an outage.
+    Each request deposits `ratio` tokens up to `burst`, each retry withdraws one.
+    """
+    def __init__(self, ratio: float = 0.2, burst: float = 10) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._balances: dict[str, float] = {}
+
+    def deposit(self, host: str) -> None:
+        balance = self._balances.get(host, self.burst)
+        self._balances[host] = min(balance + self.ratio, self.burst)
+
+    def withdraw(self, host: str) -> bool:
+        balance = self._balances.get(host, self.burst)
+        if balance < 1:
+            return False
+        self._balances[host] = balance - 1
+        return True
+
+    def balance(self, host: str) -> float:
+        return self._balances.get(host, self.burst)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy of :class:`HTTPClient`.
+
+    Transient failures are retried with jittered exponential backoff.
+    For 429 the wait is taken from `x-rate-limit-reset` or `retry-after` when present.
+    Requests with a non-idempotent method (POST) are only retried on 429,
+    which is returned before the request is processed.
+
+    Parameters
+    ----------
+    max_attempts : :class:`int`, default=3
+        Maximum number of attempts per request, including the first one.
+    base_delay : :class:`float`, default=1.0
+        Backoff delay of the first retry in seconds.
+    max_delay : :class:`float`, default=60.0
+        Maximum backoff delay in seconds.
+    max_reset_wait : :class:`float`, default=900.0
+        A 429 whose reset is further away than this is not retried.
+    retry_statuses : frozenset[:class:`int`]
+        The statuses to retry.
+    budget : :class:`RetryBudget`
+        The per-host retry budget.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    max_reset_wait: float = 900.0
+    retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES
+    budget: RetryBudget = field(default_factory=RetryBudget)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1.')
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter delay before the retry following the `attempt`-th attempt.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def reset_wait(self, headers: Headers) -> float | None:
+        """
+        Seconds until the rate limit resets according to the response headers, or None.
+        """
+        retry_after = headers.get('retry-after')
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                pass
+        reset = headers.get('x-rate-limit-reset')
+        if reset is not None:
+            try:
+                return max(int(reset) - time.time(), 0) + RESET_MARGIN
+            except ValueError:
+                pass
+        return None
+
+    def should_retry(self, method: str, status_code: int | None) -> bool:
+        """
+        status_code:
+            None for a transport error (no response).
+        """
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return status_code == 429
+        return status_code is None or status_code in self.retry_statuses
+
+    def retry_delay(self, url: str, method: str, attempt: int, status_code: int | None, headers: Headers | None) -> float | None:
+        """
+        Returns the seconds to wait before retrying, or None if the request must not be retried.
+        The retry budget is checked separately by the caller.
+        """
+        if attempt >= self.max_attempts or not self.should_retry(method, status_code):
+            return None
+        delay = None
+        if headers is not None and status_code in (429, 503):
+            delay = self.reset_wait(headers)
+            if delay is not None and delay > self.max_reset_wait:
+                logger.info(f'Not retrying {method} {url[:100]}: resets in {delay:.0f} seconds.')
+                return None
+        if delay is None:
+            delay = self.backoff(attempt)
+        return delay
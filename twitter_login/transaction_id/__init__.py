@@ -1 +1,2 @@
-from .transaction import ClientTransaction
+from .transaction import ClientTransaction, ClientTransactionState
+from .provider import ClientTransactionProvider, default_provider
@@ -3,6 +3,7 @@ import re
 ADDITIONAL_RANDOM_NUMBER: int = 3
 DEFAULT_KEYWORD: str = "obfiowerehiring"
 
+ON_DEMAND_FILE_NAME: str = "ondemand.s"
 ON_DEMAND_FILE_URL: str = "https://abs.twimg.com/responsive-web/client-web/ondemand.s.{filename}a.js"
 ON_DEMAND_FILE_REGEX: re.Pattern = re.compile(
     r""",(\d+):["']ondemand\.s["']""", flags=(re.VERBOSE | re.MULTILINE))
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import weakref
+from logging import getLogger
+from pathlib import Path
+
+from curl_cffi import AsyncSession
+
+from ..gql_endpoints.cache import default_dir, dump_json, load_json
+from .transaction import ClientTransaction, ClientTransactionState
+from .utils import get_ondemand_file_hash, get_ondemand_file_url, handle_x_migration_async
+
+logger = getLogger(__name__)
+
+DEFAULT_TTL = 3600
+
+
+def validate_transaction_state(data):
+    if not isinstance(data, dict):
+        return f'Invalid data type "{data.__class__.__name__}"'
+    for k in ('key', 'animation_key', 'ondemand_hash'):
+        if not isinstance(data.get(k), str):
+            return f'Invalid "{k}"'
+    if not isinstance(data.get('row_index'), int):
+        return 'Invalid "row_index"'
+    indices = data.get('key_bytes_indices')
+    if not isinstance(indices, list) or not all(isinstance(i, int) for i in indices):
+        return 'Invalid "key_bytes_indices"'
+    if not isinstance(data.get('fetched_at'), (int, float)):
+        return 'Invalid "fetched_at"'
+    if set(data) - {'key', 'animation_key', 'row_index', 'key_bytes_indices', 'ondemand_hash', 'fetched_at'}:
+        return 'Unknown keys'
+
+
+class ClientTransactionStore:
+    """
+    ClientTransactionState cache keyed by the ondemand file hash.
+    Stored in the GQLCache directory.
+    """
+    def __init__(self, cache_dir: str | Path | None = None) -> None:
+        if cache_dir is None:
+            cache_dir = default_dir
+        self.dir = Path(cache_dir)
+
+    def path(self, ondemand_hash: str) -> Path:
+        return self.dir / f'client_transaction.{ondemand_hash}.json'
+
+    def load(self, ondemand_hash: str) -> ClientTransactionState | None:
+        data = load_json(self.path(ondemand_hash), validate_transaction_state)
+        if data is None or data['ondemand_hash'] != ondemand_hash:
+            return None
+        return ClientTransactionState.from_dict(data)
+
+    def latest(self) -> ClientTransactionState | None:
+        """
+        Returns the most recently fetched state.
+        """
+        if not self.dir.exists():
+            return None
+        states = []
+        for path in self.dir.glob('client_transaction.*.json'):
+            data = load_json(path, validate_transaction_state)
+            if data is not None:
+                states.append(ClientTransactionState.from_dict(data))
+        return max(states, key=lambda s: s.fetched_at, default=None)
+
+    def save(self, state: ClientTransactionState) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        dump_json(self.path(state.ondemand_hash), state.to_dict(), validate_transaction_state)
+
+    def clear(self) -> None:
+        if not self.dir.exists():
+            return
+        for path in self.dir.glob('client_transaction.*.json'):
+            path.unlink(missing_ok=True)
+
+
+class ClientTransactionProvider:
+    """
+    Fetches the ClientTransaction inputs once and shares the instance between clients.
+    The derived values are cached on disk for `ttl` seconds, keyed by the ondemand file hash.
+    The instance can be shared by clients running on different event loops, also in
+    different threads: the shared state is guarded by a thread lock and a single fetch
+    runs at a time, the other loops await its result.
+    """
+    def __init__(self, cache_dir: str | Path | None = None, ttl: float = DEFAULT_TTL) -> None:
+        self.store = ClientTransactionStore(cache_dir)
+        self.ttl = ttl
+        # guards the attributes below, which are shared by the event loops
+        self._mutex = threading.Lock()
+        # one lock per event loop, created on first use (an asyncio.Lock is bound to a loop)
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = weakref.WeakKeyDictionary()
+        self._transaction: ClientTransaction | None = None
+        self._state: ClientTransactionState | None = None
+        # result of the fetch in progress in any event loop
+        self._fetching: concurrent.futures.Future[ClientTransactionState] | None = None
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._mutex:
+            lock = self._locks.get(loop)
+            if lock is None:
+                lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def is_expired(self, state: ClientTransactionState) -> bool:
+        return state.fetched_at + self.ttl < time.time()
+
+    async def get(self, ondemand_hash: str | None = None) -> ClientTransaction:
+        """
+        Returns the shared ClientTransaction.
+
+        ondemand_hash:
+            The current ondemand file hash if already known (e.g. from the GQL html).
+            A cached state for the hash is used without any network request.
+        """
+        async with self._lock():
+            with self._mutex:
+                state, transaction = self._state, self._transaction
+            if (
+                state is not None and not self.is_expired(state)
+                and (not ondemand_hash or state.ondemand_hash == ondemand_hash)
+            ):
+                return transaction
+
+            if ondemand_hash:
+                state = self.store.load(ondemand_hash)
+            else:
+                state = self.store.latest()
+            if state is None or self.is_expired(state):
+                state = await self._fetch_once()
+            transaction = ClientTransaction.from_state(state)
+            with self._mutex:
+                self._state = state
+                self._transaction = transaction
+            return transaction
+
+    async def _fetch_once(self) -> ClientTransactionState:
+        with self._mutex:
+            future = self._fetching
+            owner = future is None
+            if owner:
+                future = self._fetching = concurrent.futures.Future()
+        if not owner:
+            # fetched by another event loop
+            return await asyncio.wrap_future(future)
+
+        try:
+            state = await self.fetch()
+            self.store.save(state)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(state)
+            return state
+        finally:
+            with self._mutex:
+                self._fetching = None
+
+    async def fetch(self) -> ClientTransactionState:
+        async with AsyncSession() as session:
+            home_page_response = await handle_x_migration_async(session=session)
+            ondemand_hash = get_ondemand_file_hash(home_page_response)
+            cached = self.store.load(ondemand_hash)
+            if cached is not None:
+                # the ondemand file is unchanged, only the home page values are refreshed
+                transaction = ClientTransaction.from_home_page(
+                    home_page_response, cached.row_index, cached.key_bytes_indices
+                )
+            else:
+                ondemand_file_url = get_ondemand_file_url(ondemand_hash=ondemand_hash)
+                ondemand_file = await session.get(url=ondemand_file_url)
+                transaction = ClientTransaction(home_page_response, ondemand_file)
+        logger.info(f'Fetched ClientTransaction data (ondemand.s.{ondemand_hash})')
+        return transaction.to_state(ondemand_hash)
+
+    def invalidate(self) -> None:
+        """
+        Discards the shared instance and the disk cache.
+        """
+        with self._mutex:
+            self._transaction = None
+            self._state = None
+        self.store.clear()
+
+
+#: Provider shared by all clients in the process unless another one is given.
+default_provider = ClientTransactionProvider()
@@ -5,14 +5,36 @@ import time
 import random
 import base64
 import hashlib
+from dataclasses import asdict, dataclass
 from functools import reduce
 from typing import Union, List, Optional
 from .cubic_curve import Cubic
 from .interpolate import interpolate
 from .rotation import convert_rotation_to_matrix
-from .utils import Math, float_to_hex, is_odd, base64_encode, validate_response
+from .utils import Math, float_to_hex, is_odd, validate_response
 from .constants import INDICES_REGEX, ADDITIONAL_RANDOM_NUMBER, DEFAULT_KEYWORD
 
+# XOR_TABLES[n] maps every byte to byte ^ n, used with bytes.translate
+XOR_TABLES = [bytes(i ^ n for i in range(256)) for n in range(256)]
+
+
+@dataclass(frozen=True)
+class ClientTransactionState:
+    # values derived from the home page and the ondemand file
+    key: str
+    animation_key: str
+    row_index: int
+    key_bytes_indices: List[int]
+    ondemand_hash: str
+    fetched_at: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClientTransactionState":
+        return cls(**data)
+
 
 class ClientTransaction:
 
@@ -33,6 +55,55 @@ class ClientTransaction:
         self.key_bytes = self.get_key_bytes(key=self.key)
         self.animation_key = self.get_animation_key(
             key_bytes=self.key_bytes, home_page_response=self.home_page_response)
+        self.key_prefix = bytes(self.key_bytes)
+
+    @classmethod
+    def from_values(cls, key: str, animation_key: str, row_index: int, key_bytes_indices: List[int], random_keyword: Optional[str] = None, random_number: Optional[int] = None) -> "ClientTransaction":
+        # build an instance from already derived values without parsing any page
+        instance = cls.__new__(cls)
+        instance.home_page_response = None
+        instance.ondemand_file_response = None
+        instance.random_keyword = random_keyword or DEFAULT_KEYWORD
+        instance.random_number = random_number or ADDITIONAL_RANDOM_NUMBER
+        instance.row_index = row_index
+        instance.key_bytes_indices = list(key_bytes_indices)
+        instance.key = key
+        instance.key_bytes = instance.get_key_bytes(key=key)
+        instance.animation_key = animation_key
+        instance.key_prefix = bytes(instance.key_bytes)
+        return instance
+
+    @classmethod
+    def from_state(cls, state: ClientTransactionState) -> "ClientTransaction":
+        return cls.from_values(state.key, state.animation_key, state.row_index, state.key_bytes_indices)
+
+    @classmethod
+    def from_home_page(cls, home_page_response: bs4.BeautifulSoup, row_index: int, key_bytes_indices: List[int]) -> "ClientTransaction":
+        # the indices depend only on the ondemand file, so they can be reused while its hash is unchanged
+        validate_response(home_page_response)
+        instance = cls.__new__(cls)
+        instance.home_page_response = home_page_response
+        instance.ondemand_file_response = None
+        instance.random_keyword = DEFAULT_KEYWORD
+        instance.random_number = ADDITIONAL_RANDOM_NUMBER
+        instance.row_index = row_index
+        instance.key_bytes_indices = list(key_bytes_indices)
+        instance.key = instance.get_key(home_page_response=home_page_response)
+        instance.key_bytes = instance.get_key_bytes(key=instance.key)
+        instance.animation_key = instance.get_animation_key(
+            key_bytes=instance.key_bytes, home_page_response=home_page_response)
+        instance.key_prefix = bytes(instance.key_bytes)
+        return instance
+
+    def to_state(self, ondemand_hash: str, fetched_at: Optional[float] = None) -> ClientTransactionState:
+        return ClientTransactionState(
+            key=self.key,
+            animation_key=self.animation_key,
+            row_index=self.row_index,
+            key_bytes_indices=list(self.key_bytes_indices),
+            ondemand_hash=ondemand_hash,
+            fetched_at=fetched_at or time.time()
+        )
 
     def get_indices(self, ondemand_file_response: str):
         key_byte_indices = []
@@ -125,27 +196,48 @@ class ClientTransaction:
         animation_key = self.animate(frames=frame_row, target_time=target_time)
         return animation_key
 
-    def generate_transaction_id(self, method: str, path: str, home_page_response: Optional[bs4.BeautifulSoup] = None, key: Optional[str] = None, animation_key: Optional[str] = None, time_now: Optional[int] = None) -> str:
-        time_now = time_now or math.floor(
-            (time.time() * 1000 - 1682924400 * 1000) / 1000)
-        time_now_bytes = [(time_now >> (i * 8)) & 0xFF for i in range(4)]
-        key = key or self.key or self.get_key(
-            home_page_response=home_page_response)
-        key_bytes = self.get_key_bytes(key=key)
-        animation_key = animation_key or self.animation_key or self.get_animation_key(
-            key_bytes=key_bytes, home_page_response=home_page_response)
+    def get_time_now(self) -> int:
+        return math.floor((time.time() * 1000 - 1682924400 * 1000) / 1000)
+
+    def get_hash(self, method: str, path: str, time_now: int, animation_key: str) -> bytes:
         # hash_val = hashlib.sha256(f"{method}!{path}!{time_now}bird{animation_key}".encode()).digest()
-        hash_val = hashlib.sha256(
+        return hashlib.sha256(
             f"{method}!{path}!{time_now}{self.random_keyword}{animation_key}".encode()).digest()
-        # hash_bytes = [int(hash_val[i]) for i in range(len(hash_val))]
-        hash_bytes = list(hash_val)
-        random_num = random.randint(0, 255)
-        bytes_arr = [*key_bytes, *time_now_bytes, *
-                     hash_bytes[:16], self.random_number]
-        out = bytearray(
-            [random_num, *[item ^ random_num for item in bytes_arr]])
-        return base64_encode(out).strip("=")
 
+    def build_transaction_id(self, key_prefix: bytes, time_now: int, hash_val: bytes, random_num: int) -> str:
+        # [random_num, *(key_bytes + time_now_bytes + hash_bytes[:16] + [random_number]) ^ random_num]
+        payload = b"".join((
+            key_prefix, (time_now & 0xFFFFFFFF).to_bytes(4, "little"),
+            hash_val[:16], bytes((self.random_number,))))
+        out = bytes((random_num,)) + payload.translate(XOR_TABLES[random_num])
+        return base64.b64encode(out).decode().rstrip("=")
+
+    def generate_transaction_id(self, method: str, path: str, home_page_response: Optional[bs4.BeautifulSoup] = None, key: Optional[str] = None, animation_key: Optional[str] = None, time_now: Optional[int] = None) -> str:
+        time_now = time_now or self.get_time_now()
+        if key is None and self.key:
+            key_prefix = self.key_prefix
+        else:
+            key = key or self.key or self.get_key(
+                home_page_response=home_page_response)
+            key_prefix = bytes(self.get_key_bytes(key=key))
+        animation_key = animation_key or self.animation_key or self.get_animation_key(
+            key_bytes=list(key_prefix), home_page_response=home_page_response)
+        hash_val = self.get_hash(method, path, time_now, animation_key)
+        return self.build_transaction_id(key_prefix, time_now, hash_val, random.randint(0, 255))
+
+    def generate_transaction_ids(self, method: str, paths: Union[str, List[str]], n: int = 1) -> List[str]:
+        # ids for a burst of requests: the hash is computed once per path
+        # and only the random byte differs between the n ids of a path.
+        if isinstance(paths, str):
+            paths = [paths]
+        time_now = self.get_time_now()
+        ids = []
+        for path in paths:
+            hash_val = self.get_hash(method, path, time_now, self.animation_key)
+            for random_num in random.randbytes(n):
+                ids.append(self.build_transaction_id(
+                    self.key_prefix, time_now, hash_val, random_num))
+        return ids
 
 if __name__ == "__main__":
     pass
@@ -55,10 +55,15 @@ def get_migration_form(response: bs4.BeautifulSoup):
     return {"method": method, "url": url, "data": request_payload}
 
 
-def get_ondemand_file_url(response: bs4.BeautifulSoup):
-    on_demand_file_index = ON_DEMAND_FILE_REGEX.search(str(response)).group(1)
+def get_ondemand_file_hash(response: bs4.BeautifulSoup):
+    html = str(response)
+    on_demand_file_index = ON_DEMAND_FILE_REGEX.search(html).group(1)
     regex = re.compile(ON_DEMAND_HASH_PATTERN.format(on_demand_file_index))
-    filename = regex.search(str(response)).group(1)
+    return regex.search(html).group(1)
+
+
+def get_ondemand_file_url(response: bs4.BeautifulSoup = None, ondemand_hash: str = None):
+    filename = ondemand_hash or get_ondemand_file_hash(response)
     return ON_DEMAND_FILE_URL.format(filename=filename)
 
 